@@ -49,6 +49,7 @@ class Settings(BaseSettings):
     scraping_delay: float = 2.0
     max_retries: int = 3
     request_timeout: int = 30
+    html_parser: str = "lxml"  # parser do BeautifulSoup (lxml, html.parser, html5lib)
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     
     # Configurações de agendamento
@@ -78,6 +79,18 @@ class Settings(BaseSettings):
     mercadolivre_base_url: str = "https://www.mercadolivre.com.br"
     mercadolivre_search_url: str = "https://lista.mercadolivre.com.br"
     
+    # Páginas de resultado iniciadas por segundo, por site
+    amazon_rate_limit: float = 2.0
+    ebay_rate_limit: float = 4.0
+    mercadolivre_rate_limit: float = 4.0
+    
+    # Teto global de requisições HTTP por segundo, somando todos os sites,
+    # buscas, páginas de detalhes e novas tentativas (0 = sem teto). O padrão
+    # 0.5 (uma requisição a cada 2 s) é o ritmo conservador original e
+    # prevalece sobre os limites por site acima; valores >= 1 permitem
+    # rajadas de até esse número de requisições
+    global_requests_per_second: float = 0.5
+    
     # Configurações de filtros
     default_max_price: float = 1000.0
     default_min_price: float = 0.0
@@ -94,8 +107,14 @@ class Settings(BaseSettings):
     
     # Configurações de performance
     max_threads: int = 5
-    cache_duration: int = 60
     use_cache: bool = True
+    # Cache de respostas HTTP em disco (SQLite). Desligado por padrão: com ele,
+    # o monitoramento agendado de preços veria respostas de até cache_duration
+    # minutos atrás
+    http_cache_enabled: bool = False
+    http_cache_path: str = str(Path(__file__).resolve().parent.parent / "data" / "http_cache")
+    cache_duration: int = 60  # minutos (cache de respostas HTTP)
+    max_connections: int = 100  # conexões keep-alive no pool HTTP
     
     @field_validator('email_recipients', mode='before')
     @classmethod
@@ -168,19 +187,22 @@ class Settings(BaseSettings):
                 "base_url": self.amazon_base_url,
                 "search_url": self.amazon_search_url,
                 "delay": self.scraping_delay,
-                "timeout": self.request_timeout
+                "timeout": self.request_timeout,
+                "rate_limit": self.amazon_rate_limit
             },
             "ebay": {
                 "base_url": self.ebay_base_url,
                 "search_url": self.ebay_search_url,
                 "delay": self.scraping_delay,
-                "timeout": self.request_timeout
+                "timeout": self.request_timeout,
+                "rate_limit": self.ebay_rate_limit
             },
             "mercadolivre": {
                 "base_url": self.mercadolivre_base_url,
                 "search_url": self.mercadolivre_search_url,
                 "delay": self.scraping_delay,
-                "timeout": self.request_timeout
+                "timeout": self.request_timeout,
+                "rate_limit": self.mercadolivre_rate_limit
             }
         }
         
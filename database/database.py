@@ -22,6 +22,24 @@ from utils.logger import setup_logger, log_database_operation
 
 logger = setup_logger(__name__)
 
+# Máximo de valores por IN (...): o SQLite limita as variáveis por consulta
+# (999 em versões anteriores à 3.32)
+_IN_CHUNK_SIZE = 500
+
+
+def _chunks(values) -> List[List]:
+    """
+    Divide os valores em blocos de até _IN_CHUNK_SIZE itens.
+    
+    Args:
+        values: Coleção de valores
+        
+    Returns:
+        Lista de blocos
+    """
+    values = list(values)
+    return [values[i:i + _IN_CHUNK_SIZE] for i in range(0, len(values), _IN_CHUNK_SIZE)]
+
 
 class DatabaseManager:
     """
@@ -104,9 +122,21 @@ class DatabaseManager:
         
         with self.get_session() as db:
             try:
+                # Buscar produtos existentes em lote (uma consulta por chave)
+                by_url, by_external_id = self._find_existing_products(db, products_data)
+                
+                new_products = []
+                new_history = []
+                
                 for product_data in products_data:
+                    url = product_data.get('url')
+                    external_id = product_data.get('external_id') or product_data.get('asin')
+                    site = product_data.get('site')
+                    
                     # Verificar se produto já existe
-                    existing_product = self._find_existing_product(db, product_data)
+                    existing_product = by_url.get(url) if url else None
+                    if existing_product is None and external_id and site:
+                        existing_product = by_external_id.get((site, external_id))
                     
                     if existing_product:
                         # Atualizar produto existente
@@ -117,20 +147,27 @@ class DatabaseManager:
                     else:
                         # Criar novo produto
                         new_product = create_product_from_dict(product_data)
-                        db.add(new_product)
-                        db.flush()  # Para obter o ID
+                        new_products.append(new_product)
                         
                         # Criar histórico de preço inicial
-                        price_history = PriceHistory(
-                            product_id=new_product.id,
+                        new_history.append(PriceHistory(
+                            product=new_product,
                             price=new_product.current_price,
                             original_price=new_product.original_price,
                             session_id=session_id
-                        )
-                        db.add(price_history)
+                        ))
+                        
+                        # Registrar para deduplicar repetições no mesmo lote
+                        if url:
+                            by_url[url] = new_product
+                        if external_id and site:
+                            by_external_id[(site, external_id)] = new_product
                         
                         saved_products.append(new_product)
                 
+                # Inserção em lote: um único flush gera executemany
+                db.add_all(new_products)
+                db.add_all(new_history)
                 db.commit()
                 
                 log_database_operation(
@@ -149,39 +186,35 @@ class DatabaseManager:
         
         return saved_products
     
-    def _find_existing_product(self, db: Session, product_data: Dict) -> Optional[Product]:
+    def _find_existing_products(self, db: Session, products_data: List[Dict]) -> Tuple[Dict, Dict]:
         """
-        Encontra produto existente baseado em URL ou ID externo.
+        Encontra em lote os produtos já existentes por URL e por ID externo.
         
         Args:
             db: Sessão do banco
-            product_data: Dados do produto
+            products_data: Lista de dados dos produtos
             
         Returns:
-            Produto existente ou None
-        """
-        url = product_data.get('url')
-        external_id = product_data.get('external_id') or product_data.get('asin')
-        site = product_data.get('site')
+            Tupla (produtos por URL, produtos por (site, ID externo))
+        """
+        urls = {p['url'] for p in products_data if p.get('url')}
+        external_ids = {
+            p.get('external_id') or p.get('asin')
+            for p in products_data
+            if (p.get('external_id') or p.get('asin')) and p.get('site')
+        }
         
-        # Buscar por URL primeiro
-        if url:
-            product = db.query(Product).filter(Product.url == url).first()
-            if product:
-                return product
+        by_url = {}
+        for chunk in _chunks(urls):
+            for product in db.query(Product).filter(Product.url.in_(chunk)):
+                by_url.setdefault(product.url, product)
         
-        # Buscar por ID externo e site
-        if external_id and site:
-            product = db.query(Product).filter(
-                and_(
-                    Product.external_id == external_id,
-                    Product.site == site
-                )
-            ).first()
-            if product:
-                return product
+        by_external_id = {}
+        for chunk in _chunks(external_ids):
+            for product in db.query(Product).filter(Product.external_id.in_(chunk)):
+                by_external_id.setdefault((product.site, product.external_id), product)
         
-        return None
+        return by_url, by_external_id
     
     async def _update_existing_product(self, db: Session, product: Product, 
                                      product_data: Dict, session_id: Optional[int]) -> Product:
@@ -214,7 +247,7 @@ class DatabaseManager:
         # Se preço mudou, criar registro no histórico
         if abs(old_price - new_price) > 0.01:  # Diferença mínima para evitar ruído
             price_history = PriceHistory(
-                product_id=product.id,
+                product=product,
                 price=new_price,
                 original_price=product_data.get('original_price'),
                 session_id=session_id
@@ -23,6 +23,11 @@ import json
 import csv
 import io
 
+try:
+    import orjson  # Serialização JSON em C (opcional)
+except ImportError:
+    orjson = None
+
 from .simple_templates import SimpleEmailTemplates
 from utils.logger import setup_logger, log_email_sent
 
@@ -378,6 +383,12 @@ class EmailService:
             if not products:
                 return None
             
+            # orjson serializa datetime nativamente (ISO 8601)
+            if orjson is not None:
+                return orjson.dumps(
+                    products, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                ).decode('utf-8')
+            
             # Limpar dados para JSON
             clean_products = []
             for product in products:
@@ -19,6 +19,11 @@ from database.database import DatabaseManager
 from email_service.email_sender import EmailService
 from utils.logger import setup_logger
 
+try:
+    import orjson  # Serialização JSON em C (opcional)
+except ImportError:
+    orjson = None
+
 logger = setup_logger(__name__)
 
 
@@ -68,6 +73,12 @@ Exemplos de uso:
         help="Número máximo de resultados (padrão: 50)"
     )
     
+    parser.add_argument(
+        "--details",
+        action="store_true",
+        help="Buscar também a página de detalhes de cada produto"
+    )
+    
     parser.add_argument(
         "--send-email",
         action="store_true",
@@ -156,6 +167,15 @@ async def main():
             print("❌ Nenhum produto encontrado")
             return
         
+        # Detalhes dos produtos (páginas buscadas em paralelo)
+        if args.details:
+            with_url = [product for product in products if product.get('url')]
+            details = await scraper.get_details_bulk([product['url'] for product in with_url])
+            for product, product_details in zip(with_url, details):
+                if product_details:
+                    product['details'] = product_details
+            logger.info(f"Detalhes obtidos: {sum(1 for d in details if d)}/{len(with_url)} produtos")
+        
         # Salvar no banco de dados
         if args.save_to_db:
             session_data = {
@@ -207,6 +227,9 @@ async def main():
         logger.error(f"Erro durante execução: {e}")
         print(f"❌ Erro: {e}")
         sys.exit(1)
+    
+    finally:
+        await scraper.close()
 
 
 async def save_to_file(products: List[dict], filename: str, format_type: str):
@@ -215,8 +238,12 @@ async def save_to_file(products: List[dict], filename: str, format_type: str):
     import pandas as pd
     
     if format_type == "json":
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(products, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(products, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(products, f, ensure_ascii=False, indent=2)
     
     elif format_type == "csv":
         df = pd.DataFrame(products)
@@ -229,28 +256,31 @@ async def save_to_file(products: List[dict], filename: str, format_type: str):
 
 def display_summary(products: List[dict], search_term: str):
     """Exibe resumo dos resultados."""
-    print("\n" + "="*60)
-    print(f"📊 RESUMO DO SCRAPING: {search_term}")
-    print("="*60)
+    lines = [
+        "\n" + "="*60,
+        f"📊 RESUMO DO SCRAPING: {search_term}",
+        "="*60,
+    ]
     
     if not products:
-        print("❌ Nenhum produto encontrado")
+        lines.append("❌ Nenhum produto encontrado")
+        print("\n".join(lines))
         return
     
     # Estatísticas básicas
     total_products = len(products)
     prices = [p.get("price", 0) for p in products if p.get("price", 0) > 0]
     
-    print(f"📦 Total de produtos: {total_products}")
+    lines.append(f"📦 Total de produtos: {total_products}")
     
     if prices:
         min_price = min(prices)
         max_price = max(prices)
         avg_price = sum(prices) / len(prices)
         
-        print(f"💰 Menor preço: R$ {min_price:.2f}")
-        print(f"💰 Maior preço: R$ {max_price:.2f}")
-        print(f"💰 Preço médio: R$ {avg_price:.2f}")
+        lines.append(f"💰 Menor preço: R$ {min_price:.2f}")
+        lines.append(f"💰 Maior preço: R$ {max_price:.2f}")
+        lines.append(f"💰 Preço médio: R$ {avg_price:.2f}")
     
     # Resumo por site
     sites = {}
@@ -258,24 +288,29 @@ def display_summary(products: List[dict], search_term: str):
         site = product.get("site", "Desconhecido")
         sites[site] = sites.get(site, 0) + 1
     
-    print("\n🌐 Produtos por site:")
-    for site, count in sites.items():
-        print(f"  • {site}: {count} produtos")
+    lines.append("\n🌐 Produtos por site:")
+    lines.extend(f"  • {site}: {count} produtos" for site, count in sites.items())
     
     # Mostrar alguns produtos
-    print("\n🛒 Primeiros produtos encontrados:")
-    for i, product in enumerate(products[:5], 1):
-        title = product.get("title", "Sem título")[:50]
-        price = product.get("price", 0)
-        site = product.get("site", "N/A")
+    head = products[:5]
+    lines.append("\n🛒 Primeiros produtos encontrados:")
+    for i, product in enumerate(head, 1):
+        title, price, site = (
+            product.get("title", "Sem título")[:50],
+            product.get("price", 0.0),
+            product.get("site", "N/A"),
+        )
         
-        print(f"  {i}. {title}...")
-        print(f"     💰 R$ {price:.2f} | 🌐 {site}")
+        lines.append(f"  {i}. {title}...")
+        lines.append(f"     💰 R$ {price:.2f} | 🌐 {site}")
+    
+    if total_products > len(head):
+        lines.append(f"  ... e mais {total_products - len(head)} produtos")
     
-    if total_products > 5:
-        print(f"  ... e mais {total_products - 5} produtos")
+    lines.append("\n✅ Scraping concluído com sucesso!")
     
-    print("\n✅ Scraping concluído com sucesso!")
+    # Uma única escrita no stdout
+    print("\n".join(lines))
 
 
 if __name__ == "__main__":
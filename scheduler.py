@@ -28,7 +28,7 @@ from config.settings import Settings
 from database.database import DatabaseManager
 from scrapers import ScraperFactory
 from email_service.email_sender import EmailService
-from utils.logger import setup_logger, log_scheduler_job
+from utils.logger import setup_logger, log_scheduler_job, cleanup_old_logs
 
 logger = setup_logger(__name__)
 
@@ -116,6 +116,15 @@ class ScrapingScheduler:
             replace_existing=True
         )
         
+        # Job de limpeza diária dos arquivos de log
+        self.scheduler.add_job(
+            self._log_cleanup_job,
+            CronTrigger(hour=3, minute=0),  # 3h todos os dias
+            id='log_cleanup',
+            name='Limpeza de Logs',
+            replace_existing=True
+        )
+        
         # Job de resumo diário
         if self.settings.send_daily_summary:
             self.scheduler.add_job(
@@ -162,10 +171,13 @@ class ScrapingScheduler:
                     )
                     
                     # Executar scraping
-                    products = await scraper.search_products(
-                        search_config['search'],
-                        max_results=search_config['max_results']
-                    )
+                    try:
+                        products = await scraper.search_products(
+                            search_config['search'],
+                            max_results=search_config['max_results']
+                        )
+                    finally:
+                        await scraper.close()
                     
                     if products:
                         # Criar sessão
@@ -197,12 +209,12 @@ class ScrapingScheduler:
                         all_products.extend(products)
                         
                         logger.info(
-                            f"Scraping {search_config['site']} - {search_config['search']}: "
-                            f"{len(products)} produtos"
+                            "Scraping {} - {}: {} produtos",
+                            search_config['site'], search_config['search'], len(products)
                         )
                 
                 except Exception as e:
-                    logger.error(f"Erro no scraping {search_config}: {e}")
+                    logger.error("Erro no scraping {}: {}", search_config, e)
                     continue
             
             # Enviar relatório por e-mail
@@ -214,11 +226,11 @@ class ScrapingScheduler:
                 )
             
             log_scheduler_job('daily_scraping', 'COMPLETED')
-            logger.info(f"Scraping diário concluído: {len(all_products)} produtos")
+            logger.info("Scraping diário concluído: {} produtos", len(all_products))
             
         except Exception as e:
             log_scheduler_job('daily_scraping', 'FAILED')
-            logger.error(f"Erro no scraping diário: {e}")
+            logger.error("Erro no scraping diário: {}", e)
     
     async def _weekly_cleanup_job(self):
         """
@@ -236,6 +248,19 @@ class ScrapingScheduler:
             log_scheduler_job('weekly_cleanup', 'FAILED')
             logger.error(f"Erro na limpeza semanal: {e}")
     
+    async def _log_cleanup_job(self):
+        """
+        Job de limpeza diária dos arquivos de log antigos.
+        """
+        try:
+            # I/O de disco fora do loop de eventos
+            await asyncio.to_thread(cleanup_old_logs)
+            log_scheduler_job('log_cleanup', 'COMPLETED')
+            
+        except Exception as e:
+            log_scheduler_job('log_cleanup', 'FAILED')
+            logger.error(f"Erro na limpeza de logs: {e}")
+    
     async def _daily_summary_job(self):
         """
         Job de envio de resumo diário.
@@ -293,7 +318,7 @@ class ScrapingScheduler:
                         recipients=self.settings.email_recipients
                     )
                 
-                logger.info(f"Alerta de preços enviado: {len(price_changes)} mudanças")
+                logger.info("Alerta de preços enviado: {} mudanças", len(price_changes))
             
             log_scheduler_job('price_monitoring', 'COMPLETED')
             
@@ -309,7 +334,7 @@ class ScrapingScheduler:
             event: Evento do job
         """
         job_id = event.job_id
-        logger.info(f"Job '{job_id}' executado com sucesso")
+        logger.info("Job '{}' executado com sucesso", job_id)
     
     def _job_error_listener(self, event):
         """
@@ -334,7 +359,7 @@ class ScrapingScheduler:
         """
         try:
             job = self.scheduler.add_job(**job_config)
-            logger.info(f"Job customizado adicionado: {job.id}")
+            logger.info("Job customizado adicionado: {}", job.id)
             return job.id
             
         except Exception as e:
@@ -353,7 +378,7 @@ class ScrapingScheduler:
         """
         try:
             self.scheduler.remove_job(job_id)
-            logger.info(f"Job removido: {job_id}")
+            logger.info("Job removido: {}", job_id)
             return True
             
         except Exception as e:
@@ -390,12 +415,20 @@ class ScrapingScheduler:
             self.running = True
             
             logger.info("Agendador iniciado")
-            logger.info(f"Jobs ativos: {len(self.scheduler.get_jobs())}")
+            jobs = self.scheduler.get_jobs()
+            logger.info("Jobs ativos: {}", len(jobs))
             
-            # Listar jobs
-            for job in self.scheduler.get_jobs():
-                next_run = job.next_run_time.strftime('%d/%m/%Y %H:%M:%S') if job.next_run_time else 'N/A'
-                logger.info(f"  - {job.name} (ID: {job.id}) - Próxima execução: {next_run}")
+            # Listar jobs (formatação da data adiada até o nível INFO ser aceito)
+            for job in jobs:
+                logger.opt(lazy=True).info(
+                    "  - {} (ID: {}) - Próxima execução: {}",
+                    lambda: job.name,
+                    lambda: job.id,
+                    lambda: (
+                        job.next_run_time.strftime('%d/%m/%Y %H:%M:%S')
+                        if job.next_run_time else 'N/A'
+                    )
+                )
             
         except Exception as e:
             logger.error(f"Erro ao iniciar agendador: {e}")
@@ -436,7 +469,7 @@ def signal_handler(signum, frame):
         signum: Número do sinal
         frame: Frame atual
     """
-    logger.info(f"Sinal {signum} recebido, parando agendador...")
+    logger.info("Sinal {} recebido, parando agendador...", signum)
     sys.exit(0)
 
 
@@ -16,12 +16,19 @@ Uso:
     scraper = ScraperFactory.create_scraper('amazon', settings)
 """
 
-from .base_scraper import BaseScraper
-from .amazon_scraper import AmazonScraper
-from .ebay_scraper import EbayScraper
-from .mercadolivre_scraper import MercadoLivreScraper
+import importlib
+
 from .scraper_factory import ScraperFactory
 
+# Classes importadas sob demanda (ver __getattr__): importar o pacote não
+# carrega bs4/requests nem os scrapers que não forem usados
+_LAZY_IMPORTS = {
+    "BaseScraper": ".base_scraper",
+    "AmazonScraper": ".amazon_scraper",
+    "EbayScraper": ".ebay_scraper",
+    "MercadoLivreScraper": ".mercadolivre_scraper",
+}
+
 __all__ = [
     "BaseScraper",
     "AmazonScraper",
@@ -32,3 +39,12 @@ __all__ = [
 
 __version__ = "1.0.0"
 __author__ = "Seu Nome"
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -10,16 +10,75 @@ Data: 2025-09-20
 """
 
 import asyncio
+from functools import lru_cache
 from typing import List, Dict, Optional, Any
 from urllib.parse import urlencode
 import re
 
-from .base_scraper import BaseScraper
-from utils.helpers import clean_text, format_price, extract_rating, extract_number
+import soupsieve as sv
+from bs4 import SoupStrainer
+
+from .base_scraper import (
+    BaseScraper, DETAILS_CACHE_SIZE, DETAILS_CACHE_TTL, _index_by_class, _first_by_class
+)
+from utils.helpers import async_lru_cache, clean_text, format_price, extract_rating, extract_number
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Todos os layouts de resultado da Amazon marcam o contêiner com data-asin;
+# o restante da página (menus, rodapé, scripts) não precisa virar árvore.
+_RESULTS_STRAINER = SoupStrainer(attrs={'data-asin': True})
+
+# Verificação de dígitos em C (frozenset.isdisjoint) em vez de gerador por caractere
+_DIGITS = frozenset('0123456789')
+
+# Conversões de texto repetidas (avaliações, contagens) memorizadas por texto
+_extract_rating = lru_cache(maxsize=1024)(extract_rating)
+_extract_number = lru_cache(maxsize=2048)(extract_number)
+
+# Seletores compilados uma única vez (evita reparsear o CSS a cada produto)
+_PRODUCT_SELECTORS = tuple(sv.compile(s) for s in (
+    '[data-component-type="s-search-result"]',
+    '.s-result-item',
+    '[data-asin]'
+))
+_TITLE_SELECTORS = tuple(sv.compile(s) for s in (
+    'h2 a span',
+    '.s-size-mini .s-link-style a',
+    'h2 .a-link-normal',
+    '.s-title-instructions-style'
+))
+_URL_SELECTORS = tuple(sv.compile(s) for s in (
+    'h2 a',
+    '.s-link-style',
+    'a[href*="/dp/"]'
+))
+# Os seletores de classe simples mais comuns (.a-price-whole, .a-icon-alt,
+# .a-size-base, .s-image, ...) são resolvidos pelo índice de classes montado
+# em uma única passada; as tuplas abaixo são apenas os fallbacks.
+_PRICE_SELECTORS = tuple(sv.compile(s) for s in (
+    '.a-price .a-offscreen',
+    '.a-price-range .a-offscreen',
+    '.a-price-symbol + .a-price-whole'
+))
+_ORIGINAL_PRICE_SELECTORS = tuple(sv.compile(s) for s in (
+    '.a-text-price .a-offscreen',
+    '.a-price.a-text-price .a-offscreen'
+))
+_RATING_SELECTORS = tuple(sv.compile(s) for s in (
+    '[aria-label*="estrela"]',
+    '.a-star-mini .a-icon-alt'
+))
+_REVIEWS_SELECTORS = tuple(sv.compile(s) for s in (
+    'a[href*="#customerReviews"]',
+    '.a-link-normal[href*="reviews"]'
+))
+_IMAGE_SELECTORS = tuple(sv.compile(s) for s in (
+    'img[data-src]',
+    '.a-dynamic-image'
+))
+
 
 class AmazonScraper(BaseScraper):
     """
@@ -34,6 +93,9 @@ class AmazonScraper(BaseScraper):
     - URLs
     """
     
+    # Contêineres de resultado, um seletor por layout
+    PRODUCT_SELECTORS = _PRODUCT_SELECTORS
+    
     def __init__(self, settings: Any):
         """
         Inicializa o scraper da Amazon.
@@ -45,6 +107,7 @@ class AmazonScraper(BaseScraper):
         
         self.base_url = getattr(settings, 'amazon_base_url', 'https://www.amazon.com.br')
         self.search_url = getattr(settings, 'amazon_search_url', 'https://www.amazon.com.br/s')
+        self.pages_per_second = getattr(settings, 'amazon_rate_limit', 2.0)
         
         # Configurar headers específicos da Amazon
         self._setup_amazon_headers()
@@ -53,7 +116,7 @@ class AmazonScraper(BaseScraper):
     
     def _setup_amazon_headers(self):
         """Configura headers específicos para Amazon."""
-        self.session.headers.update({
+        self.headers.update({
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7',
             'Cache-Control': 'no-cache',
@@ -85,50 +148,21 @@ class AmazonScraper(BaseScraper):
         """
         logger.info(f"Buscando produtos na Amazon: '{search_term}'")
         
-        products = []
-        page = 1
         max_results = filters.get('max_results', 50)
         
-        while len(products) < max_results:
-            try:
-                # Construir parâmetros de busca
-                params = {
-                    'k': search_term,
-                    'page': page,
-                    'ref': 'sr_pg_' + str(page)
-                }
-                
-                # Adicionar filtros de preço se especificados
-                if 'min_price' in filters or 'max_price' in filters:
-                    price_range = self._build_price_filter(filters)
-                    if price_range:
-                        params.update(price_range)
-                
-                # Fazer requisição
-                response = await self._make_request(self.search_url, params)
-                if not response:
-                    break
-                
-                # Parse da página
-                soup = self._parse_html(response.text)
-                page_products = self._extract_products_from_page(soup)
-                
-                if not page_products:
-                    logger.info(f"Nenhum produto encontrado na página {page}")
-                    break
-                
-                products.extend(page_products)
-                logger.info(f"Página {page}: {len(page_products)} produtos encontrados")
-                
-                page += 1
-                
-                # Evitar muitas páginas
-                if page > 10:
-                    break
-                    
-            except Exception as e:
-                logger.error(f"Erro na página {page}: {e}")
-                break
+        # Parâmetros fixos codificados uma única vez; só a página muda
+        static_params = {'k': search_term}
+        if 'min_price' in filters or 'max_price' in filters:
+            static_params.update(self._build_price_filter(filters))
+        base_query = f"{self.search_url}?{urlencode(static_params)}"
+        
+        # Apenas os contêineres de resultado viram árvore no parsing
+        products = await self._search_pages(
+            lambda page: (f"{base_query}&page={page}&ref=sr_pg_{page}", None),
+            max_results,
+            parse_only=_RESULTS_STRAINER,
+            filters=filters
+        )
         
         # Aplicar filtros
         filtered_products = self._apply_filters(products, **filters)
@@ -152,144 +186,88 @@ class AmazonScraper(BaseScraper):
         
         return price_params
     
-    def _extract_products_from_page(self, soup) -> List[Dict[str, Any]]:
-        """Extrai produtos de uma página de resultados."""
-        products = []
-        
-        # Seletores para diferentes layouts da Amazon
-        selectors = [
-            '[data-component-type="s-search-result"]',
-            '.s-result-item',
-            '[data-asin]'
-        ]
-        
-        product_elements = []
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                product_elements = elements
-                break
-        
-        logger.debug(f"Encontrados {len(product_elements)} elementos de produto")
-        
-        for element in product_elements:
-            try:
-                product = self._parse_product_element(element, self.base_url)
-                if product and self._validate_product(product):
-                    products.append(product)
-            except Exception as e:
-                logger.debug(f"Erro ao processar elemento: {e}")
-                continue
-        
-        return products
+    def _extract_item_price(self, element, classes=None) -> float:
+        """Extrai o preço de um elemento de produto da Amazon."""
+        price = 0.0
+        if classes is not None:
+            node = _first_by_class(classes, 'a-price-whole')
+        else:
+            node = element.find(class_='a-price-whole')
+        if node is not None:
+            price = self._extract_price(node)
+        if price <= 0:
+            price = self._first(element, _PRICE_SELECTORS, self._extract_price, 0.0)
+        return price
     
     def _parse_product_element(self, element, base_url: str) -> Optional[Dict[str, Any]]:
         """Faz parsing de um elemento de produto da Amazon."""
         try:
+            # Índice de classes: uma única travessia da subárvore
+            nodes = element.find_all(True)
+            classes = _index_by_class(nodes)
+            
             # Título
-            title_selectors = [
-                'h2 a span',
-                '.s-size-mini .s-link-style a',
-                'h2 .a-link-normal',
-                '.s-title-instructions-style'
-            ]
-            title = ""
-            for selector in title_selectors:
-                title = self._extract_text(element, selector)
-                if title:
-                    break
+            title = self._first(element, _TITLE_SELECTORS, self._extract_text, "")
             
             if not title:
                 return None
             
             # URL
-            url_selectors = [
-                'h2 a',
-                '.s-link-style',
-                'a[href*="/dp/"]'
-            ]
-            url = ""
-            for selector in url_selectors:
-                url = self._extract_url(element, selector, base_url=base_url)
-                if url:
-                    break
+            url = self._first(
+                element, _URL_SELECTORS,
+                lambda el, sel: self._extract_url(el, sel, base_url=base_url), ""
+            )
             
             # Preço
-            price_selectors = [
-                '.a-price-whole',
-                '.a-price .a-offscreen',
-                '.a-price-range .a-offscreen',
-                '.a-price-symbol + .a-price-whole'
-            ]
-            price = 0.0
-            for selector in price_selectors:
-                price = self._extract_price(element, selector)
-                if price > 0:
-                    break
+            price = self._extract_item_price(element, classes)
             
             # Preço original (se em promoção)
-            original_price_selectors = [
-                '.a-text-price .a-offscreen',
-                '.a-price.a-text-price .a-offscreen'
-            ]
-            original_price = 0.0
-            for selector in original_price_selectors:
-                original_price = self._extract_price(element, selector)
-                if original_price > 0:
-                    break
+            original_price = self._first(element, _ORIGINAL_PRICE_SELECTORS, self._extract_price, 0.0)
             
             # Avaliação
-            rating_selectors = [
-                '.a-icon-alt',
-                '[aria-label*="estrela"]',
-                '.a-star-mini .a-icon-alt'
-            ]
             rating = 0.0
-            for selector in rating_selectors:
-                rating_text = self._extract_text(element, selector)
-                if rating_text:
-                    rating = extract_rating(rating_text)
-                    if rating > 0:
-                        break
+            node = _first_by_class(classes, 'a-icon-alt')
+            if node is not None:
+                rating = _extract_rating(self._extract_text(node))
+            if rating <= 0:
+                rating = self._first(
+                    element, _RATING_SELECTORS,
+                    lambda el, sel: _extract_rating(self._extract_text(el, sel)), 0.0
+                )
             
             # Número de avaliações
-            reviews_selectors = [
-                '.a-size-base',
-                'a[href*="#customerReviews"]',
-                '.a-link-normal[href*="reviews"]'
-            ]
             num_reviews = 0
-            for selector in reviews_selectors:
-                reviews_text = self._extract_text(element, selector)
-                if reviews_text and any(char.isdigit() for char in reviews_text):
-                    num_reviews = extract_number(reviews_text)
-                    if num_reviews > 0:
-                        break
+            node = _first_by_class(classes, 'a-size-base')
+            if node is not None:
+                num_reviews = self._extract_reviews(node)
+            if num_reviews <= 0:
+                num_reviews = self._first(element, _REVIEWS_SELECTORS, self._extract_reviews, 0)
             
             # Imagem
-            image_selectors = [
-                '.s-image',
-                'img[data-src]',
-                '.a-dynamic-image'
-            ]
             image_url = ""
-            for selector in image_selectors:
-                image_url = self._extract_image_url(element, selector, base_url)
-                if image_url:
-                    break
+            node = _first_by_class(classes, 's-image')
+            if node is not None:
+                image_url = self._extract_image_url(node, base_url=base_url)
+            if not image_url:
+                image_url = self._first(
+                    element, _IMAGE_SELECTORS,
+                    lambda el, sel: self._extract_image_url(el, sel, base_url), ""
+                )
             
-            # Frete grátis
-            free_shipping = bool(
-                element.select('.a-color-base:contains("Frete GRÁTIS")') or
-                element.select('[aria-label*="Frete grátis"]')
+            # Frete grátis: busca de substring no texto e nos aria-label,
+            # sem o pseudo-seletor :-soup-contains (que extrai texto nó a nó)
+            free_shipping = 'Frete GRÁTIS' in element.get_text() or any(
+                'Frete grátis' in node.get('aria-label', '') for node in nodes
             )
             
             # Prime
-            is_prime = bool(element.select('.a-icon-prime'))
+            is_prime = 'a-icon-prime' in classes
             
             # Disponibilidade
-            availability_text = self._extract_text(element, '.a-color-success, .a-color-price')
-            in_stock = 'estoque' in availability_text.lower() or 'disponível' in availability_text.lower()
+            node = _first_by_class(classes, 'a-color-success', 'a-color-price')
+            availability_text = self._extract_text(node) if node is not None else ""
+            availability_lower = availability_text.lower()
+            in_stock = 'estoque' in availability_lower or 'disponível' in availability_lower
             
             # ASIN (identificador único da Amazon)
             asin = element.get('data-asin', '')
@@ -313,9 +291,18 @@ class AmazonScraper(BaseScraper):
             return product
             
         except Exception as e:
-            logger.debug(f"Erro ao fazer parse do produto: {e}")
+            logger.debug("Erro ao fazer parse do produto: {}", e)
             return None
     
+    def _extract_reviews(self, element, selector=None) -> int:
+        """Extrai o número de avaliações (0 se o texto não tiver dígitos)."""
+        reviews_text = self._extract_text(element, selector)
+        if reviews_text and not _DIGITS.isdisjoint(reviews_text):
+            return _extract_number(reviews_text)
+        return 0
+    
+    @async_lru_cache(maxsize=DETAILS_CACHE_SIZE, ttl=DETAILS_CACHE_TTL,
+                     key=lambda self, product_url: (type(self), product_url))
     async def get_product_details(self, product_url: str) -> Optional[Dict[str, Any]]:
         """
         Obtém detalhes adicionais de um produto específico da Amazon.
@@ -331,7 +318,7 @@ class AmazonScraper(BaseScraper):
             if not response:
                 return None
             
-            soup = self._parse_html(response.text)
+            soup = self._parse_html(response.content)
             
             # Descrição detalhada
             description_selectors = [
@@ -366,12 +353,12 @@ class AmazonScraper(BaseScraper):
             
             # Categoria
             category_elements = soup.select('#wayfinding-breadcrumbs_feature_div a')
-            categories = [clean_text(cat.get_text()) for cat in category_elements]
+            categories = list(dict.fromkeys(clean_text(cat.get_text()) for cat in category_elements))
             
             return {
                 'detailed_description': description,
                 'specifications': specs,
-                'images': list(set(images)),  # Remover duplicatas
+                'images': list(dict.fromkeys(images)),  # Remover duplicatas (mantendo a ordem)
                 'categories': categories,
                 'brand': self._extract_text(soup, '#bylineInfo'),
                 'model': specs.get('Número do modelo', '')
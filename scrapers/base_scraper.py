@@ -3,20 +3,189 @@ Base scraper class with common functionality for all scrapers.
 """
 
 import asyncio
+import functools
+import json
+import math
+import os
+import random
+import re
+import socket
 import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Union, Callable, Tuple
 from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
 import requests
-from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.request import ACCEPT_ENCODING
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
 import logging
 
-from utils.helpers import rate_limit, retry, clean_text, format_price
+from utils.helpers import token_bucket, retry, clean_text, format_price
 from utils.logger import setup_logger
 
+try:
+    import numpy as np  # Filtros vetorizados para listas grandes (opcional)
+except ImportError:
+    np = None
+
+try:
+    import orjson  # Leitura mais rápida do JSON embutido nas páginas (opcional)
+except ImportError:
+    orjson = None
+
+try:
+    import requests_cache  # Cache HTTP em disco (opcional)
+except ImportError:
+    requests_cache = None
+
 logger = setup_logger(__name__)
 
+# User-Agents de navegadores atuais, sorteados por scraper
+_UA_POOL = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/126.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/125.0.0.0 Safari/537.36 Edg/125.0.0.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:128.0) Gecko/20100101 Firefox/128.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/126.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) '
+    'Version/17.5 Safari/605.1.15',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14.5; rv:128.0) Gecko/20100101 Firefox/128.0',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/126.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:127.0) Gecko/20100101 Firefox/127.0',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/124.0.0.0 Safari/537.36 OPR/110.0.0.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/125.0.0.0 Safari/537.36',
+)
+
+# Limite de páginas de resultado por busca
+MAX_PAGES = 10
+
+# Acima deste tamanho os filtros usam máscaras NumPy em vez de list comprehension
+_VECTORIZE_THRESHOLD = 128
+
+# Esquemas aceitos nas URLs de produto
+_URL_SCHEMES = ('http://', 'https://')
+
+# Detalhes de produto em cache por processo (por scraper e URL)
+DETAILS_CACHE_SIZE = 1024
+DETAILS_CACHE_TTL = 3600  # segundos
+
+# Arquivo SQLite do cache de respostas HTTP (quando settings não define um);
+# caminho absoluto, independente do diretório de trabalho
+HTTP_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'data', 'http_cache')
+
+# JSON embutido por páginas Next.js, com os resultados já estruturados
+_NEXT_DATA_RE = re.compile(rb'<script[^>]*id="__NEXT_DATA__"[^>]*>(.+?)</script>', re.DOTALL)
+
+# Textos de preço se repetem muito entre produtos ("R$ 99,90", ...)
+_format_price = functools.lru_cache(maxsize=4096)(format_price)
+
+
+# TCP keep-alive nas conexões do pool: conexões ociosas entre buscas seguem
+# abertas, evitando refazer DNS e handshake TLS a cada nova rodada
+_KEEPALIVE_SOCKET_OPTIONS = HTTPConnection.default_socket_options + [
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+if hasattr(socket, 'TCP_KEEPIDLE'):
+    _KEEPALIVE_SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter cujas conexões usam TCP keep-alive."""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', _KEEPALIVE_SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _json_price(value: Any) -> float:
+    """Converte um preço do JSON embutido (número, texto ou {'value': ...})."""
+    if isinstance(value, dict):
+        value = value.get('value', value.get('amount'))
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        return _format_price(value) or 0.0
+    return 0.0
+
+
+def _global_request_bucket(settings) -> Optional[Callable[[], float]]:
+    """
+    Token bucket do teto global de requisições (global_requests_per_second).
+    
+    Abaixo de 1 req/s o bucket comporta uma única requisição (sem rajada);
+    a partir de 1 req/s, rajadas de até esse número de requisições.
+    
+    Args:
+        settings: Configurações do sistema
+        
+    Returns:
+        Função de reserva (ver token_bucket) ou None se não houver teto
+    """
+    rate = getattr(settings, 'global_requests_per_second', 0.5)
+    if not rate or rate <= 0:
+        return None
+    calls = max(1.0, float(rate))
+    return token_bucket(calls, calls / rate)
+
+
+def _class_strainer(*classes: str) -> SoupStrainer:
+    """
+    SoupStrainer que mantém só os elementos com alguma das classes CSS.
+    
+    Durante o parsing o atributo class ainda é a string crua ("a b c"),
+    por isso a comparação é feita token a token.
+    """
+    wanted = frozenset(classes)
+    
+    def has_class(value) -> bool:
+        if not value:
+            return False
+        tokens = value.split() if isinstance(value, str) else value
+        return not wanted.isdisjoint(tokens)
+    
+    return SoupStrainer(attrs={'class': has_class})
+
+
+def _select_one(element, selector):
+    """
+    Seleciona o primeiro elemento que casa com o seletor.
+    
+    Aceita tanto uma string CSS quanto um seletor já compilado
+    com soupsieve.compile (evita recompilar em loops).
+    """
+    if isinstance(selector, str):
+        return element.select_one(selector)
+    return selector.select_one(element)
+
+
+def _index_by_class(nodes: List[Any]) -> Dict[str, Tuple[int, Any]]:
+    """
+    Indexa, para cada classe CSS, o primeiro nó (em ordem de documento)
+    que a possui. Recebe os nós da subárvore já listados (find_all(True)).
+    """
+    index = {}
+    for position, node in enumerate(nodes):
+        for css_class in node.get('class', ()):
+            if css_class not in index:
+                index[css_class] = (position, node)
+    return index
+
+
+def _first_by_class(index: Dict[str, Tuple[int, Any]], *classes: str):
+    """Retorna o primeiro nó (em ordem de documento) com alguma das classes."""
+    hits = [index[css_class] for css_class in classes if css_class in index]
+    if not hits:
+        return None
+    return min(hits, key=lambda hit: hit[0])[1]
+
 
 class BaseScraper(ABC):
     """
@@ -30,6 +199,25 @@ class BaseScraper(ABC):
     - Validação de robots.txt
     """
     
+    # Seletores compilados dos contêineres de produto, um por layout do site
+    PRODUCT_SELECTORS: Tuple[Any, ...] = ()
+    
+    # Caminhos (chaves aninhadas) até a lista de resultados no JSON embutido
+    # da página; vazio desativa a leitura do JSON para o site
+    JSON_RESULT_PATHS: Tuple[Tuple[str, ...], ...] = ()
+    
+    # robots.txt interpretado, por host (compartilhado entre instâncias)
+    _ROBOTS_CACHE: Dict[str, RobotFileParser] = {}
+    
+    # Sessão HTTP (pool keep-alive) compartilhada por todos os scrapers,
+    # fechada quando o último scraper aberto chama close()
+    _shared_session: Optional[requests.Session] = None
+    _session_users: int = 0
+    
+    # Token bucket do teto global de requisições (global_requests_per_second),
+    # compartilhado por todos os scrapers; None enquanto nenhum foi criado
+    _request_bucket: Optional[Callable[[], float]] = None
+    
     def __init__(self, settings):
         """
         Inicializa o scraper base.
@@ -38,26 +226,96 @@ class BaseScraper(ABC):
             settings: Configurações do sistema
         """
         self.settings = settings
-        self.session = requests.Session()
-        self.ua = UserAgent()
+        self.session = self._acquire_session(settings)
+        self._closed = False
         
-        # Configurar headers padrão
-        self.session.headers.update({
-            'User-Agent': self.ua.random,
+        # Headers padrão, enviados por requisição (a sessão é compartilhada)
+        self.headers = {
+            'User-Agent': random.choice(_UA_POOL),
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': ACCEPT_ENCODING,  # inclui br quando brotli está instalado
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
-        })
+        }
         
         # Configurações específicas
         self.delay = getattr(settings, 'scraping_delay', 2.0)
         self.timeout = getattr(settings, 'request_timeout', 30)
         self.max_retries = getattr(settings, 'max_retries', 3)
+        self.html_parser = getattr(settings, 'html_parser', 'lxml')
+        
+        # Páginas de resultado iniciadas por segundo (None = sem limite);
+        # cada scraper define a partir da configuração do seu site
+        self.pages_per_second: Optional[float] = None
+        
+        # Último caminho do JSON embutido que funcionou, tentado primeiro nas
+        # próximas páginas (por instância: o parsing roda em threads)
+        self._json_results_path: Optional[Tuple[str, ...]] = None
         
         logger.info(f"Scraper inicializado: {self.__class__.__name__}")
     
+    @classmethod
+    def _acquire_session(cls, settings) -> requests.Session:
+        """
+        Retorna a sessão HTTP compartilhada, criando-a no primeiro uso.
+        
+        Args:
+            settings: Configurações do sistema
+            
+        Returns:
+            Sessão requests compartilhada
+        """
+        if BaseScraper._shared_session is None:
+            BaseScraper._shared_session = cls._create_session(settings)
+        if BaseScraper._request_bucket is None:
+            BaseScraper._request_bucket = _global_request_bucket(settings)
+        BaseScraper._session_users += 1
+        return BaseScraper._shared_session
+    
+    def _reserve_request(self) -> float:
+        """
+        Reserva uma vaga no teto global de requisições.
+        
+        Returns:
+            Espera, em segundos, antes de enviar a requisição
+        """
+        bucket = BaseScraper._request_bucket
+        return bucket() if bucket is not None else 0.0
+    
+    @staticmethod
+    def _create_session(settings) -> requests.Session:
+        """
+        Cria a sessão HTTP, com cache em disco (SQLite) quando habilitado
+        (http_cache_enabled, desligado por padrão) e pool de conexões ampliado.
+        
+        Args:
+            settings: Configurações do sistema
+            
+        Returns:
+            Sessão requests (CachedSession se o cache estiver ativo)
+        """
+        if getattr(settings, 'http_cache_enabled', False) and requests_cache is not None:
+            cache_path = getattr(settings, 'http_cache_path', None) or HTTP_CACHE_PATH
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            session = requests_cache.CachedSession(
+                cache_path,
+                backend='sqlite',
+                expire_after=getattr(settings, 'cache_duration', 60) * 60,
+                allowable_codes=(200,),
+            )
+        else:
+            session = requests.Session()
+        
+        # Pool de conexões keep-alive dimensionado para as buscas em paralelo
+        # (o padrão do requests mantém só 10 conexões por host)
+        pool_size = getattr(settings, 'max_connections', 100)
+        adapter = _KeepAliveAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        
+        return session
+    
     @abstractmethod
     def get_base_url(self) -> str:
         """
@@ -106,27 +364,47 @@ class BaseScraper(ABC):
         """
         pass
     
-    @rate_limit(calls=1, period=2)
     @retry(max_attempts=3, delay=1.0)
-    async def _make_request(self, url: str, params: Optional[Dict] = None) -> Optional[requests.Response]:
+    async def _make_request(self, url: str, params: Optional[Dict] = None,
+                            cache_bypass: bool = False) -> Optional[requests.Response]:
         """
         Faz requisição HTTP com rate limiting e retry.
         
         Args:
             url: URL para requisição
             params: Parâmetros da requisição
+            cache_bypass: Ignora o cache HTTP e força nova requisição
             
         Returns:
             Response object ou None se falhou
         """
+        if not self._robots_allows(url):
+            logger.warning(f"URL bloqueada pelo robots.txt: {url}")
+            return None
+        
         try:
             logger.debug(f"Fazendo requisição para: {url}")
             
-            response = self.session.get(
+            kwargs = {}
+            if cache_bypass and requests_cache is not None and \
+                    isinstance(self.session, requests_cache.CachedSession):
+                kwargs['force_refresh'] = True
+            
+            # Teto global (todas as instâncias e sites); vale também para retries
+            wait = self._reserve_request()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            
+            # A chamada bloqueante roda em thread para não travar o event loop,
+            # permitindo que várias páginas/sites sejam buscados em paralelo
+            response = await asyncio.to_thread(
+                self.session.get,
                 url,
                 params=params,
+                headers=self.headers,
                 timeout=self.timeout,
-                allow_redirects=True
+                allow_redirects=True,
+                **kwargs
             )
             
             response.raise_for_status()
@@ -138,17 +416,373 @@ class BaseScraper(ABC):
             logger.error(f"Erro na requisição para {url}: {e}")
             raise
     
-    def _parse_html(self, html_content: str) -> BeautifulSoup:
+    async def _search_pages(self, page_request: Callable[[int], Tuple[str, Optional[Dict]]],
+                            max_results: int,
+                            parse_only: Optional[SoupStrainer] = None,
+                            filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Busca as páginas de resultado: a primeira sozinha, as demais em lotes paralelos.
+        
+        Cada lote é planejado a partir dos produtos mantidos por página até
+        então (não dos elementos encontrados: a validação e o pré-filtro de
+        preço podem descartar boa parte deles). Novos lotes são buscados até
+        chegar a max_results, atingir MAX_PAGES ou uma página vir vazia.
+        
+        Args:
+            page_request: Função que recebe o número da página e retorna (url, params)
+            max_results: Número de produtos desejado
+            parse_only: SoupStrainer aplicado no parsing das páginas
+            filters: Filtros da busca (a faixa de preço é aplicada já no parsing)
+            
+        Returns:
+            Produtos encontrados, na ordem das páginas
+        """
+        products, found = await self._fetch_results_page(
+            page_request, 1, parse_only=parse_only, filters=filters
+        )
+        if not found:
+            return products
+        
+        semaphore = asyncio.Semaphore(getattr(self.settings, 'max_threads', 5))
+        interval = 1.0 / self.pages_per_second if self.pages_per_second else 0.0
+        next_page = 2
+        
+        while len(products) < max_results and next_page <= MAX_PAGES:
+            # Produtos mantidos por página até aqui (ao menos 1 por página)
+            kept_per_page = max(1.0, len(products) / (next_page - 1))
+            pages_needed = math.ceil((max_results - len(products)) / kept_per_page)
+            last_page = min(MAX_PAGES, next_page + pages_needed - 1)
+            
+            # Páginas do lote buscadas em paralelo: no máximo max_threads ao
+            # mesmo tempo, com inícios espaçados para respeitar pages_per_second
+            pages = await asyncio.gather(*(
+                self._fetch_results_page(page_request, page, semaphore, parse_only,
+                                         start_delay=(page - next_page + 1) * interval,
+                                         filters=filters)
+                for page in range(next_page, last_page + 1)
+            ))
+            next_page = last_page + 1
+            
+            # Consolidar em ordem, parando na primeira página sem resultados
+            for page_products, page_found in pages:
+                if not page_found:
+                    return products
+                if len(products) >= max_results:
+                    break
+                products.extend(page_products)
+        
+        return products
+    
+    async def _fetch_results_page(self, page_request: Callable[[int], Tuple[str, Optional[Dict]]],
+                                  page: int, semaphore: Optional[asyncio.Semaphore] = None,
+                                  parse_only: Optional[SoupStrainer] = None,
+                                  start_delay: float = 0.0,
+                                  filters: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Busca e extrai os produtos de uma página de resultados.
+        
+        Args:
+            page_request: Função que recebe o número da página e retorna (url, params)
+            page: Número da página
+            semaphore: Limita as requisições simultâneas (opcional)
+            parse_only: SoupStrainer aplicado no parsing da página
+            start_delay: Espera, em segundos, antes de iniciar a requisição
+            filters: Filtros da busca (pré-filtro de preço)
+            
+        Returns:
+            Tupla (produtos da página, resultados encontrados na página);
+            ([], 0) se falhou ou não há resultados
+        """
+        try:
+            if start_delay > 0:
+                await asyncio.sleep(start_delay)
+            
+            url, params = page_request(page)
+            
+            if semaphore is not None:
+                async with semaphore:
+                    response = await self._make_request(url, params)
+            else:
+                response = await self._make_request(url, params)
+            
+            if not response:
+                return [], 0
+            
+            # Parsing é CPU-bound: roda em thread para não travar as demais requisições
+            page_products, found = await asyncio.to_thread(
+                self._parse_and_extract, response.content, parse_only, filters
+            )
+            
+            if not found:
+                logger.info(f"Nenhum produto encontrado na página {page}")
+                return [], 0
+            
+            logger.info(f"Página {page}: {len(page_products)} produtos encontrados")
+            return page_products, found
+            
+        except Exception as e:
+            logger.error(f"Erro na página {page}: {e}")
+            return [], 0
+    
+    def _parse_and_extract(self, html_content: Union[str, bytes],
+                           parse_only: Optional[SoupStrainer] = None,
+                           filters: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Faz o parsing de uma página de resultados e extrai os produtos.
+        
+        Args:
+            html_content: Conteúdo HTML (str ou bytes)
+            parse_only: SoupStrainer para construir apenas as subárvores de interesse
+            filters: Filtros da busca (pré-filtro de preço)
+            
+        Returns:
+            Tupla (produtos extraídos, resultados encontrados na página)
+        """
+        # Resultados estruturados no JSON embutido dispensam o parsing do HTML
+        products = self._extract_products_from_json(html_content)
+        if products:
+            return products, len(products)
+        
+        soup = self._parse_html(html_content, parse_only=parse_only)
+        product_elements = self._find_product_elements(soup)
+        return self._extract_products(product_elements, filters), len(product_elements)
+    
+    def _find_product_elements(self, soup) -> List[Any]:
+        """
+        Localiza os contêineres de produto da página.
+        
+        Usa o primeiro seletor de PRODUCT_SELECTORS que encontrar elementos
+        (cada seletor corresponde a um layout do site).
+        
+        Args:
+            soup: Página de resultados
+            
+        Returns:
+            Elementos de produto (vazio se nenhum layout casar)
+        """
+        for selector in self.PRODUCT_SELECTORS:
+            elements = selector.select(soup)
+            if elements:
+                return elements
+        return []
+    
+    def _extract_products_from_page(self, soup, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Extrai produtos de uma página de resultados.
+        
+        Args:
+            soup: Página de resultados
+            filters: Filtros da busca (pré-filtro de preço)
+            
+        Returns:
+            Produtos válidos da página
+        """
+        return self._extract_products(self._find_product_elements(soup), filters)
+    
+    def _extract_products(self, product_elements: List[Any],
+                          filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Faz o parsing dos elementos de produto, descartando os inválidos.
+        
+        Args:
+            product_elements: Contêineres de produto da página
+            filters: Filtros da busca (pré-filtro de preço)
+            
+        Returns:
+            Produtos válidos
+        """
+        logger.debug(f"Encontrados {len(product_elements)} elementos de produto")
+        
+        min_price = filters.get('min_price') if filters else None
+        max_price = filters.get('max_price') if filters else None
+        prefilter = min_price is not None or max_price is not None
+        
+        products = []
+        for element in product_elements:
+            try:
+                # Preço fora da faixa: descarta antes de extrair os demais campos
+                if prefilter and not self._price_in_range(element, min_price, max_price):
+                    continue
+                
+                product = self._parse_product_element(element, self.base_url)
+                if product and self._validate_product(product):
+                    products.append(product)
+            except Exception as e:
+                logger.debug("Erro ao processar elemento: {}", e)
+                continue
+        
+        return products
+    
+    def _price_in_range(self, element, min_price: Optional[float], max_price: Optional[float]) -> bool:
+        """
+        Verifica, lendo apenas o preço, se o elemento pode passar no filtro de preço.
+        
+        Args:
+            element: Contêiner do produto
+            min_price: Preço mínimo (opcional)
+            max_price: Preço máximo (opcional)
+            
+        Returns:
+            False somente se o preço com certeza está fora da faixa
+        """
+        price = self._extract_item_price(element)
+        if price <= 0:
+            return True
+        return (min_price is None or price >= min_price) and (max_price is None or price <= max_price)
+    
+    def _extract_item_price(self, element, classes: Optional[Dict[str, Tuple[int, Any]]] = None) -> float:
+        """
+        Extrai o preço de um contêiner de produto.
+        
+        Cada scraper sobrescreve com a mesma regra usada no parsing completo,
+        de modo que o pré-filtro e o produto final vejam o mesmo preço.
+        
+        Args:
+            element: Contêiner do produto
+            classes: Índice de classes do elemento (opcional)
+            
+        Returns:
+            Preço ou 0.0 se não encontrado
+        """
+        return 0.0
+    
+    def _extract_products_from_json(self, html_content: Union[str, bytes]) -> List[Dict[str, Any]]:
+        """
+        Extrai produtos do JSON embutido na página (__NEXT_DATA__), se houver.
+        
+        Args:
+            html_content: Conteúdo HTML (bytes)
+            
+        Returns:
+            Produtos válidos encontrados (vazio para cair no parsing do HTML)
+        """
+        if not self.JSON_RESULT_PATHS or not isinstance(html_content, bytes):
+            return []
+        
+        match = _NEXT_DATA_RE.search(html_content)
+        if not match:
+            return []
+        
+        try:
+            data = orjson.loads(match.group(1)) if orjson is not None else json.loads(match.group(1))
+        except ValueError:
+            return []
+        
+        paths = self.JSON_RESULT_PATHS
+        if self._json_results_path is not None:
+            paths = (self._json_results_path,) + paths
+        
+        for path in paths:
+            items = data
+            for key in path:
+                items = items.get(key) if isinstance(items, dict) else None
+            if not isinstance(items, list):
+                continue
+            
+            products = []
+            for item in items:
+                product = self._product_from_json(item) if isinstance(item, dict) else None
+                if product and self._validate_product(product):
+                    products.append(product)
+            
+            if products:
+                self._json_results_path = path
+                return products
+        
+        return []
+    
+    def _product_from_json(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Converte um resultado do JSON embutido no dicionário de produto.
+        
+        Args:
+            item: Resultado do JSON da página
+            
+        Returns:
+            Dicionário do produto ou None
+        """
+        return None
+    
+    async def close(self):
+        """
+        Libera a sessão HTTP compartilhada.
+        
+        A sessão (e as conexões do pool) só é fechada quando nenhum
+        outro scraper ainda a utiliza.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        
+        BaseScraper._session_users -= 1
+        if BaseScraper._session_users <= 0 and BaseScraper._shared_session is self.session:
+            self.session.close()
+            BaseScraper._shared_session = None
+            BaseScraper._session_users = 0
+    
+    def _parse_html(self, html_content: Union[str, bytes],
+                    parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
         """
         Faz parsing do HTML usando BeautifulSoup.
         
+        Usa o parser configurado (lxml, em C, por padrão) e recorre ao
+        html.parser caso ele não esteja instalado. Aceita bytes (response.content)
+        para que a decodificação aconteça uma única vez, no parser.
+        
         Args:
-            html_content: Conteúdo HTML
+            html_content: Conteúdo HTML (str ou bytes)
+            parse_only: SoupStrainer para construir apenas as subárvores de interesse
             
         Returns:
             Objeto BeautifulSoup
         """
-        return BeautifulSoup(html_content, 'html.parser')
+        try:
+            return BeautifulSoup(html_content, self.html_parser, parse_only=parse_only)
+        except FeatureNotFound:
+            logger.warning(f"Parser '{self.html_parser}' indisponível, usando html.parser")
+            self.html_parser = 'html.parser'
+            return BeautifulSoup(html_content, self.html_parser, parse_only=parse_only)
+    
+    @staticmethod
+    def _first(element, selectors, extractor: Callable, default: Any = None) -> Any:
+        """
+        Retorna o primeiro valor não vazio extraído com uma lista de seletores.
+        
+        Args:
+            element: Elemento HTML
+            selectors: Seletores tentados em ordem
+            extractor: Função (element, selector) -> valor
+            default: Valor padrão se nenhum seletor produzir valor
+            
+        Returns:
+            Primeiro valor verdadeiro ou o padrão
+        """
+        return next(
+            (value for value in (extractor(element, s) for s in selectors) if value),
+            default
+        )
+    
+    def _extract_text_by_class(self, classes: Dict[str, Tuple[int, Any]], *css_classes: str) -> str:
+        """
+        Extrai o texto do primeiro nó com texto não vazio, tentando as classes em ordem.
+        
+        Equivale a tentar os seletores '.classe' um a um, mas consultando o
+        índice montado por _index_by_class em vez de percorrer a subárvore.
+        
+        Args:
+            classes: Índice de classes do elemento
+            *css_classes: Classes CSS, em ordem de prioridade
+            
+        Returns:
+            Texto extraído e limpo (vazio se nenhuma classe tiver texto)
+        """
+        for css_class in css_classes:
+            hit = classes.get(css_class)
+            if hit is not None:
+                text = self._extract_text(hit[1])
+                if text:
+                    return text
+        return ""
     
     def _extract_text(self, element, selector: str = None, default: str = "") -> str:
         """
@@ -156,7 +790,7 @@ class BaseScraper(ABC):
         
         Args:
             element: Elemento HTML
-            selector: Seletor CSS (opcional)
+            selector: Seletor CSS ou seletor compilado (opcional)
             default: Valor padrão se não encontrar
             
         Returns:
@@ -164,7 +798,7 @@ class BaseScraper(ABC):
         """
         try:
             if selector:
-                target = element.select_one(selector)
+                target = _select_one(element, selector)
                 if target:
                     return clean_text(target.get_text())
             else:
@@ -180,7 +814,7 @@ class BaseScraper(ABC):
         
         Args:
             element: Elemento HTML
-            selector: Seletor CSS (opcional)
+            selector: Seletor CSS ou seletor compilado (opcional)
             default: Valor padrão se não encontrar
             
         Returns:
@@ -188,11 +822,11 @@ class BaseScraper(ABC):
         """
         try:
             if selector:
-                target = element.select_one(selector)
+                target = _select_one(element, selector)
                 if target:
-                    return format_price(target.get_text())
+                    return _format_price(target.get_text())
             else:
-                return format_price(element.get_text())
+                return _format_price(element.get_text())
         except (AttributeError, TypeError):
             pass
         
@@ -204,16 +838,17 @@ class BaseScraper(ABC):
         
         Args:
             element: Elemento HTML
-            selector: Seletor CSS (opcional)
+            selector: Seletor CSS ou seletor compilado (opcional)
             attr: Atributo que contém a URL
             base_url: URL base para URLs relativas
             
         Returns:
             URL completa
         """
+        url = ""
         try:
             if selector:
-                target = element.select_one(selector)
+                target = _select_one(element, selector)
                 if target:
                     url = target.get(attr, "")
             else:
@@ -233,33 +868,33 @@ class BaseScraper(ABC):
         
         Args:
             element: Elemento HTML
-            selector: Seletor CSS (opcional)
+            selector: Seletor CSS ou seletor compilado (opcional)
             base_url: URL base para URLs relativas
             
         Returns:
             URL da imagem
         """
-        # Tentar diferentes atributos de imagem
-        attrs = ['src', 'data-src', 'data-lazy-src', 'data-original']
-        
         try:
-            if selector:
-                img_element = element.select_one(selector)
-            else:
-                img_element = element
+            img_element = _select_one(element, selector) if selector else element
+            if img_element is None:
+                return ""
+            
+            # Tentar diferentes atributos de imagem
+            attrs = img_element.attrs
+            url = (
+                attrs.get('src') or attrs.get('data-src') or
+                attrs.get('data-lazy-src') or attrs.get('data-original')
+            )
+            if not url:
+                return ""
             
-            if img_element:
-                for attr in attrs:
-                    url = img_element.get(attr)
-                    if url:
-                        if base_url:
-                            return urljoin(base_url, url)
-                        return url
+            # URLs de imagem geralmente já são absolutas (CDN)
+            if url.startswith(('http:', 'https:')) or not base_url:
+                return url
+            return urljoin(base_url, url)
         
         except (AttributeError, TypeError):
-            pass
-        
-        return ""
+            return ""
     
     def _validate_product(self, product: Dict[str, Any]) -> bool:
         """
@@ -271,26 +906,17 @@ class BaseScraper(ABC):
         Returns:
             True se produto é válido
         """
-        required_fields = ['title', 'price', 'url']
-        
-        for field in required_fields:
-            if not product.get(field):
-                return False
-        
-        # Validar preço
-        try:
-            price = float(product['price'])
-            if price <= 0:
-                return False
-        except (ValueError, TypeError):
+        if not product.get('title'):
             return False
         
-        # Validar URL
-        url = product.get('url', '')
-        if not url or not url.startswith(('http://', 'https://')):
+        # Validar preço (format_price sempre devolve float ou None)
+        price = product.get('price')
+        if not isinstance(price, (int, float)) or not (price > 0 and math.isfinite(price)):
             return False
         
-        return True
+        # Validar URL
+        url = product.get('url')
+        return bool(url) and url.startswith(_URL_SCHEMES)
     
     def _apply_filters(self, products: List[Dict[str, Any]], **filters) -> List[Dict[str, Any]]:
         """
@@ -303,27 +929,24 @@ class BaseScraper(ABC):
         Returns:
             Lista de produtos filtrados
         """
-        filtered = products.copy()
-        
-        # Filtro de preço mínimo
         min_price = filters.get('min_price')
-        if min_price is not None:
-            filtered = [p for p in filtered if p.get('price', 0) >= min_price]
-        
-        # Filtro de preço máximo
         max_price = filters.get('max_price')
-        if max_price is not None:
-            filtered = [p for p in filtered if p.get('price', 0) <= max_price]
-        
-        # Filtro de avaliação mínima
         min_rating = filters.get('min_rating')
-        if min_rating is not None:
-            filtered = [p for p in filtered if p.get('rating', 0) >= min_rating]
-        
-        # Filtro de frete grátis
         free_shipping = filters.get('free_shipping_only')
-        if free_shipping:
-            filtered = [p for p in filtered if p.get('free_shipping', False)]
+        
+        if np is not None and len(products) > _VECTORIZE_THRESHOLD:
+            filtered = self._filter_vectorized(
+                products, min_price, max_price, min_rating, free_shipping
+            )
+        else:
+            # Todos os filtros em uma única passada (preço, avaliação, frete grátis)
+            filtered = [
+                p for p in products
+                if (min_price is None or p.get('price', 0) >= min_price)
+                and (max_price is None or p.get('price', 0) <= max_price)
+                and (min_rating is None or p.get('rating', 0) >= min_rating)
+                and (not free_shipping or p.get('free_shipping', False))
+            ]
         
         # Limitar número de resultados
         max_results = filters.get('max_results')
@@ -332,32 +955,105 @@ class BaseScraper(ABC):
         
         return filtered
     
-    async def check_robots_txt(self) -> bool:
+    @staticmethod
+    def _filter_vectorized(products: List[Dict[str, Any]], min_price: Optional[float],
+                           max_price: Optional[float], min_rating: Optional[float],
+                           free_shipping: bool) -> List[Dict[str, Any]]:
+        """
+        Aplica os filtros com máscaras NumPy (listas grandes de produtos).
+        
+        Os dicionários originais são preservados; só a seleção é vetorizada.
+        
+        Args:
+            products: Lista de produtos
+            min_price: Preço mínimo
+            max_price: Preço máximo
+            min_rating: Avaliação mínima
+            free_shipping: Apenas produtos com frete grátis
+            
+        Returns:
+            Lista de produtos filtrados
+        """
+        count = len(products)
+        mask = np.ones(count, dtype=bool)
+        
+        if min_price is not None or max_price is not None:
+            prices = np.fromiter((p.get('price') or 0 for p in products), dtype=float, count=count)
+            if min_price is not None:
+                mask &= prices >= min_price
+            if max_price is not None:
+                mask &= prices <= max_price
+        
+        if min_rating is not None:
+            ratings = np.fromiter((p.get('rating') or 0 for p in products), dtype=float, count=count)
+            mask &= ratings >= min_rating
+        
+        if free_shipping:
+            mask &= np.fromiter((bool(p.get('free_shipping')) for p in products), dtype=bool, count=count)
+        
+        return [products[i] for i in np.flatnonzero(mask)]
+    
+    async def check_robots_txt(self, url: Optional[str] = None) -> bool:
         """
         Verifica se o scraping é permitido pelo robots.txt.
         
+        O robots.txt é baixado e interpretado uma única vez por host; as
+        consultas seguintes usam o parser em cache.
+        
+        Args:
+            url: URL a verificar (padrão: raiz do site)
+            
         Returns:
             True se permitido
         """
         try:
             base_url = self.get_base_url()
-            robots_url = urljoin(base_url, '/robots.txt')
+            host = urlparse(base_url).netloc
             
-            response = await self._make_request(robots_url)
-            if response and response.status_code == 200:
-                robots_content = response.text
+            parser = self._ROBOTS_CACHE.get(host)
+            if parser is None:
+                robots_url = urljoin(base_url, '/robots.txt')
+                parser = RobotFileParser(robots_url)
                 
-                # Verificação básica - implementação mais robusta seria usar robotparser
-                if 'Disallow: /' in robots_content and 'User-agent: *' in robots_content:
-                    logger.warning(f"Robots.txt pode proibir scraping em {base_url}")
-                    return False
+                try:
+                    response = await self._make_request(robots_url)
+                except Exception as e:
+                    logger.warning(f"Erro ao baixar robots.txt: {e}")
+                    response = None
+                
+                if response is not None and response.status_code == 200:
+                    parser.parse(response.text.splitlines())
+                else:
+                    # Sem robots.txt acessível: tudo permitido
+                    parser.parse([])
+                self._ROBOTS_CACHE[host] = parser
             
-            return True
+            allowed = parser.can_fetch(self.headers['User-Agent'], url or base_url)
+            if not allowed:
+                logger.warning(f"Robots.txt proíbe scraping de {url or base_url}")
+            return allowed
             
         except Exception as e:
             logger.warning(f"Erro ao verificar robots.txt: {e}")
             return True  # Assumir permitido se não conseguir verificar
     
+    def _robots_allows(self, url: str) -> bool:
+        """
+        Consulta o robots.txt já carregado para o host da URL.
+        
+        Não faz requisições: hosts ainda não verificados são permitidos.
+        
+        Args:
+            url: URL a verificar
+            
+        Returns:
+            True se permitido
+        """
+        parser = self._ROBOTS_CACHE.get(urlparse(url).netloc)
+        if parser is None:
+            return True
+        return parser.can_fetch(self.headers['User-Agent'], url)
+    
     def get_site_name(self) -> str:
         """
         Retorna nome do site baseado na URL.
@@ -386,7 +1082,7 @@ class BaseScraper(ABC):
             if not response:
                 return None
             
-            soup = self._parse_html(response.text)
+            soup = self._parse_html(response.content)
             
             # Implementação básica - cada scraper pode sobrescrever
             return {
@@ -398,3 +1094,31 @@ class BaseScraper(ABC):
         except Exception as e:
             logger.error(f"Erro ao obter detalhes do produto {product_url}: {e}")
             return None
+    
+    async def get_details_bulk(self, product_urls: List[str],
+                               max_at_once: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Obtém os detalhes de vários produtos em paralelo.
+        
+        As páginas são buscadas com no máximo max_at_once requisições
+        simultâneas e inícios espaçados conforme pages_per_second.
+        
+        Args:
+            product_urls: URLs dos produtos
+            max_at_once: Limite de requisições simultâneas (padrão: max_threads)
+            
+        Returns:
+            Detalhes de cada produto, na ordem das URLs (None se falhou)
+        """
+        semaphore = asyncio.Semaphore(max_at_once or getattr(self.settings, 'max_threads', 5))
+        interval = 1.0 / self.pages_per_second if self.pages_per_second else 0.0
+        
+        async def fetch(position: int, product_url: str) -> Optional[Dict[str, Any]]:
+            if position and interval:
+                await asyncio.sleep(position * interval)
+            async with semaphore:
+                return await self.get_product_details(product_url)
+        
+        return await asyncio.gather(*(
+            fetch(position, product_url) for position, product_url in enumerate(product_urls)
+        ))
@@ -12,14 +12,80 @@ Data: 2025-09-20
 import asyncio
 from typing import List, Dict, Optional, Any
 from urllib.parse import urlencode
+import math
 import re
 
-from .base_scraper import BaseScraper
-from utils.helpers import clean_text, format_price, extract_rating, extract_number
+import soupsieve as sv
+
+from .base_scraper import (
+    BaseScraper, DETAILS_CACHE_SIZE, DETAILS_CACHE_TTL, _class_strainer, _index_by_class, _first_by_class, _json_price
+)
+from utils.helpers import async_lru_cache, clean_text, format_price, extract_rating, extract_number
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Seletores compilados uma única vez (evita reparsear o CSS a cada produto)
+_PRODUCT_SELECTORS = tuple(sv.compile(s) for s in (
+    '.s-item',
+    '.sresult',
+    '[data-view="mi:1686|iid:1"]'
+))
+# Os contêineres de resultado do eBay (layout atual e antigo) têm a classe
+# s-item ou sresult; o restante da página não precisa virar árvore.
+_RESULTS_STRAINER = _class_strainer('s-item', 'sresult')
+# Os seletores de classe simples (.s-item__title, .s-item__link,
+# .s-item__seller, ...) são resolvidos pelo índice de classes montado em uma
+# única passada; as tuplas abaixo cobrem os seletores compostos/fallbacks.
+_TITLE_SELECTORS = tuple(sv.compile(s) for s in (
+    'h3.s-item__title',
+    '.it-ttl a'
+))
+_URL_SELECTORS = tuple(sv.compile(s) for s in (
+    '.it-ttl a',
+    'a[href*="/itm/"]'
+))
+# .s-item__price (e o .notranslate dentro dele) vem do índice de classes;
+# este seletor cobre o preço do layout antigo
+_CONDTEXT_PRICE_SELECTOR = sv.compile('.u-flL.condText + .notranslate')
+_IMAGE_SELECTORS = tuple(sv.compile(s) for s in (
+    '.s-item__image img',
+    '.img img'
+))
+
+# Palavras-chave (minúsculas) das verificações de condição e frete
+_CONDITION_WORDS = ('new', 'used', 'refurbished')
+_FREE_SHIPPING_WORDS = ('free', 'grátis', 'gratis')
+
+# Valores de uma faixa de preço ("$10.99 to $24.99")
+_PRICE_RANGE_RE = re.compile(r'[\d,]+\.\d{2}')
+
+
+def _shipping_text(shipping_cost: Any) -> str:
+    """
+    Texto do frete no formato da página de busca ("Free shipping",
+    "+$12.35 shipping") a partir do shippingCost do JSON embutido.
+    """
+    if isinstance(shipping_cost, dict):
+        value = shipping_cost.get('value', shipping_cost.get('amount'))
+        currency = shipping_cost.get('currency', 'USD')
+    else:
+        value, currency = shipping_cost, 'USD'
+    
+    # Custo ausente ou ilegível não é frete grátis
+    if isinstance(value, bool):
+        return ''
+    try:
+        cost = float(value.replace(',', '') if isinstance(value, str) else value)
+    except (TypeError, ValueError):
+        return ''
+    if not math.isfinite(cost) or cost < 0:
+        return ''
+    if cost == 0.0:
+        return 'Free shipping'
+    symbol = '$' if currency == 'USD' else f'{currency} '
+    return f'+{symbol}{cost:.2f} shipping'
+
 
 class EbayScraper(BaseScraper):
     """
@@ -35,6 +101,14 @@ class EbayScraper(BaseScraper):
     - Imagens
     """
     
+    # Contêineres de resultado, um seletor por layout
+    PRODUCT_SELECTORS = _PRODUCT_SELECTORS
+    
+    # Resultados no JSON __NEXT_DATA__ das páginas de busca
+    JSON_RESULT_PATHS = (
+        ('props', 'pageProps', 'results'),
+    )
+    
     def __init__(self, settings: Any):
         """
         Inicializa o scraper do eBay.
@@ -46,6 +120,7 @@ class EbayScraper(BaseScraper):
         
         self.base_url = getattr(settings, 'ebay_base_url', 'https://www.ebay.com')
         self.search_url = getattr(settings, 'ebay_search_url', 'https://www.ebay.com/sch/i.html')
+        self.pages_per_second = getattr(settings, 'ebay_rate_limit', 4.0)
         
         # Configurar headers específicos do eBay
         self._setup_ebay_headers()
@@ -54,7 +129,7 @@ class EbayScraper(BaseScraper):
     
     def _setup_ebay_headers(self):
         """Configura headers específicos para eBay."""
-        self.session.headers.update({
+        self.headers.update({
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9,pt;q=0.8',
             'Cache-Control': 'no-cache',
@@ -82,55 +157,31 @@ class EbayScraper(BaseScraper):
         """
         logger.info(f"Buscando produtos no eBay: '{search_term}'")
         
-        products = []
-        page = 1
         max_results = filters.get('max_results', 50)
         
-        while len(products) < max_results:
-            try:
-                # Construir parâmetros de busca
-                params = {
-                    '_nkw': search_term,
-                    '_pgn': page,
-                    '_skc': 0,
-                    'rt': 'nc'
-                }
-                
-                # Adicionar filtros de preço
-                if 'min_price' in filters:
-                    params['_udlo'] = filters['min_price']
-                if 'max_price' in filters:
-                    params['_udhi'] = filters['max_price']
-                
-                # Filtro para Buy It Now apenas
-                if filters.get('buy_it_now_only'):
-                    params['LH_BIN'] = 1
-                
-                # Fazer requisição
-                response = await self._make_request(self.search_url, params)
-                if not response:
-                    break
-                
-                # Parse da página
-                soup = self._parse_html(response.text)
-                page_products = self._extract_products_from_page(soup)
-                
-                if not page_products:
-                    logger.info(f"Nenhum produto encontrado na página {page}")
-                    break
-                
-                products.extend(page_products)
-                logger.info(f"Página {page}: {len(page_products)} produtos encontrados")
-                
-                page += 1
-                
-                # Evitar muitas páginas
-                if page > 10:
-                    break
-                    
-            except Exception as e:
-                logger.error(f"Erro na página {page}: {e}")
-                break
+        # Parâmetros fixos da busca; só a página (_pgn) muda
+        base_params = {
+            '_nkw': search_term,
+            '_skc': 0,
+            'rt': 'nc'
+        }
+        
+        # Adicionar filtros de preço
+        if 'min_price' in filters:
+            base_params['_udlo'] = filters['min_price']
+        if 'max_price' in filters:
+            base_params['_udhi'] = filters['max_price']
+        
+        # Filtro para Buy It Now apenas
+        if filters.get('buy_it_now_only'):
+            base_params['LH_BIN'] = 1
+        
+        products = await self._search_pages(
+            lambda page: (self.search_url, {**base_params, '_pgn': page}),
+            max_results,
+            parse_only=_RESULTS_STRAINER,
+            filters=filters
+        )
         
         # Aplicar filtros
         filtered_products = self._apply_filters(products, **filters)
@@ -138,157 +189,135 @@ class EbayScraper(BaseScraper):
         logger.info(f"eBay: {len(filtered_products)} produtos após filtros")
         return filtered_products
     
-    def _extract_products_from_page(self, soup) -> List[Dict[str, Any]]:
-        """Extrai produtos de uma página de resultados."""
-        products = []
+    def _product_from_json(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Converte um resultado do JSON embutido do eBay em produto."""
+        title = clean_text(item.get('title') or '')
+        if not title or title.lower() in ['new listing', 'shop on ebay']:
+            return None
         
-        # Seletores para diferentes layouts do eBay
-        selectors = [
-            '.s-item',
-            '.sresult',
-            '[data-view="mi:1686|iid:1"]'
-        ]
+        image = item.get('image')
+        seller = item.get('seller')
+        location = item.get('itemLocation')
+        shipping_options = item.get('shippingOptions') or [{}]
+        shipping_cost = shipping_options[0].get('shippingCost') if isinstance(shipping_options[0], dict) else None
+        shipping_text = _shipping_text(shipping_cost)
         
-        product_elements = []
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                product_elements = elements
-                break
+        return {
+            'title': title,
+            'price': _json_price(item.get('price')),
+            'url': item.get('itemWebUrl') or item.get('url') or '',
+            'image_url': image.get('imageUrl', '') if isinstance(image, dict) else '',
+            'auction_type': 'Auction' if 'AUCTION' in (item.get('buyingOptions') or ()) else 'Buy It Now',
+            'time_left': '',
+            'seller': seller.get('username', '') if isinstance(seller, dict) else '',
+            'location': location.get('country', '') if isinstance(location, dict) else '',
+            'shipping_cost': shipping_text,
+            'free_shipping': shipping_text == 'Free shipping',
+            'condition': item.get('condition') or '',
+            'watchers': 0,
+            'site': 'eBay',
+            'currency': 'USD'
+        }
+    
+    def _extract_item_price(self, element, classes=None) -> float:
+        """Extrai o preço de um elemento de produto do eBay."""
+        if classes is not None:
+            node = _first_by_class(classes, 's-item__price')
+        else:
+            node = element.find(class_='s-item__price')
         
-        logger.debug(f"Encontrados {len(product_elements)} elementos de produto")
+        price_texts = []
+        if node is not None:
+            # O valor costuma vir no .notranslate dentro de .s-item__price
+            inner = node.find(class_='notranslate')
+            if inner is not None:
+                price_texts.append(self._extract_text(inner))
+            price_texts.append(self._extract_text(node))
+        price_texts.append(self._extract_text(element, _CONDTEXT_PRICE_SELECTOR))
         
-        for element in product_elements:
-            try:
-                product = self._parse_product_element(element, self.base_url)
-                if product and self._validate_product(product):
-                    products.append(product)
-            except Exception as e:
-                logger.debug(f"Erro ao processar elemento: {e}")
+        for price_text in price_texts:
+            if not price_text:
                 continue
-        
-        return products
+            # eBay pode ter ranges de preço, pegar o menor
+            if 'to' in price_text.lower():
+                prices = _PRICE_RANGE_RE.findall(price_text)
+                price = format_price(prices[0]) if prices else 0.0
+            else:
+                price = format_price(price_text)
+            if price > 0:
+                return price
+        return 0.0
     
     def _parse_product_element(self, element, base_url: str) -> Optional[Dict[str, Any]]:
         """Faz parsing de um elemento de produto do eBay."""
         try:
+            # Índice de classes: uma única travessia da subárvore
+            classes = _index_by_class(element.find_all(True))
+            
             # Título
-            title_selectors = [
-                '.s-item__title',
-                'h3.s-item__title',
-                '.it-ttl a'
-            ]
-            title = ""
-            for selector in title_selectors:
-                title = self._extract_text(element, selector)
-                if title and title.lower() != 'new listing':
-                    break
+            title = self._extract_text_by_class(classes, 's-item__title')
+            if not title or title.lower() == 'new listing':
+                for selector in _TITLE_SELECTORS:
+                    title = self._extract_text(element, selector)
+                    if title and title.lower() != 'new listing':
+                        break
             
             if not title or title.lower() in ['new listing', 'shop on ebay']:
                 return None
             
             # URL
-            url_selectors = [
-                '.s-item__link',
-                '.it-ttl a',
-                'a[href*="/itm/"]'
-            ]
             url = ""
-            for selector in url_selectors:
-                url = self._extract_url(element, selector, base_url=base_url)
-                if url:
-                    break
+            node = _first_by_class(classes, 's-item__link')
+            if node is not None:
+                url = self._extract_url(node, base_url=base_url)
+            if not url:
+                for selector in _URL_SELECTORS:
+                    url = self._extract_url(element, selector, base_url=base_url)
+                    if url:
+                        break
             
             # Preço
-            price_selectors = [
-                '.s-item__price .notranslate',
-                '.s-item__price',
-                '.u-flL.condText + .notranslate'
-            ]
-            price = 0.0
-            for selector in price_selectors:
-                price_text = self._extract_text(element, selector)
-                if price_text:
-                    # eBay pode ter ranges de preço, pegar o menor
-                    if 'to' in price_text.lower():
-                        prices = re.findall(r'[\d,]+\.\d{2}', price_text)
-                        if prices:
-                            price = format_price(prices[0])
-                    else:
-                        price = format_price(price_text)
-                    if price > 0:
-                        break
+            price = self._extract_item_price(element, classes)
             
-            # Tipo de leilão
+            # Tipo de leilão e tempo restante (para leilões)
             auction_type = 'Buy It Now'
-            if element.select('.s-item__time-left, .timeMs'):
-                auction_type = 'Auction'
-            
-            # Tempo restante (para leilões)
             time_left = ""
-            if auction_type == 'Auction':
-                time_left = self._extract_text(element, '.s-item__time-left, .timeMs')
+            node = _first_by_class(classes, 's-item__time-left', 'timeMs')
+            if node is not None:
+                auction_type = 'Auction'
+                time_left = self._extract_text(node)
             
             # Vendedor
-            seller_selectors = [
-                '.s-item__seller-info-text',
-                '.s-item__seller'
-            ]
-            seller = ""
-            for selector in seller_selectors:
-                seller = self._extract_text(element, selector)
-                if seller:
-                    break
+            seller = self._extract_text_by_class(classes, 's-item__seller-info-text', 's-item__seller')
             
             # Localização
-            location_selectors = [
-                '.s-item__location',
-                '.s-item__itemLocation'
-            ]
-            location = ""
-            for selector in location_selectors:
-                location = self._extract_text(element, selector)
-                if location:
-                    break
+            location = self._extract_text_by_class(classes, 's-item__location', 's-item__itemLocation')
             
             # Frete
-            shipping_selectors = [
-                '.s-item__shipping',
-                '.s-item__logisticsCost'
-            ]
-            shipping_cost = ""
-            for selector in shipping_selectors:
-                shipping_cost = self._extract_text(element, selector)
-                if shipping_cost:
-                    break
+            shipping_cost = self._extract_text_by_class(classes, 's-item__shipping', 's-item__logisticsCost')
             
-            free_shipping = 'free' in shipping_cost.lower() or 'grátis' in shipping_cost.lower()
+            shipping_lower = shipping_cost.lower()
+            free_shipping = any(word in shipping_lower for word in _FREE_SHIPPING_WORDS)
             
             # Imagem
-            image_selectors = [
-                '.s-item__image img',
-                '.img img'
-            ]
             image_url = ""
-            for selector in image_selectors:
+            for selector in _IMAGE_SELECTORS:
                 image_url = self._extract_image_url(element, selector, base_url)
                 if image_url:
                     break
             
             # Condição
-            condition_selectors = [
-                '.s-item__subtitle',
-                '.condText'
-            ]
             condition = ""
-            for selector in condition_selectors:
-                condition = self._extract_text(element, selector)
-                if condition and any(word in condition.lower() for word in ['new', 'used', 'refurbished']):
+            for css_class in ('s-item__subtitle', 'condText'):
+                node = _first_by_class(classes, css_class)
+                condition = self._extract_text(node) if node is not None else ""
+                condition_lower = condition.lower()
+                if condition and any(word in condition_lower for word in _CONDITION_WORDS):
                     break
             
             # Watchers (pessoas observando)
             watchers = 0
-            watchers_text = self._extract_text(element, '.s-item__watchheart')
+            watchers_text = self._extract_text_by_class(classes, 's-item__watchheart')
             if watchers_text:
                 watchers = extract_number(watchers_text)
             
@@ -312,9 +341,11 @@ class EbayScraper(BaseScraper):
             return product
             
         except Exception as e:
-            logger.debug(f"Erro ao fazer parse do produto eBay: {e}")
+            logger.debug("Erro ao fazer parse do produto eBay: {}", e)
             return None
     
+    @async_lru_cache(maxsize=DETAILS_CACHE_SIZE, ttl=DETAILS_CACHE_TTL,
+                     key=lambda self, product_url: (type(self), product_url))
     async def get_product_details(self, product_url: str) -> Optional[Dict[str, Any]]:
         """
         Obtém detalhes adicionais de um produto específico do eBay.
@@ -330,7 +361,7 @@ class EbayScraper(BaseScraper):
             if not response:
                 return None
             
-            soup = self._parse_html(response.text)
+            soup = self._parse_html(response.content)
             
             # Descrição
             description = self._extract_text(soup, '#desc_div, .u-flL.condText')
@@ -357,7 +388,7 @@ class EbayScraper(BaseScraper):
             return {
                 'detailed_description': description,
                 'specifications': specs,
-                'images': list(set(images)),
+                'images': list(dict.fromkeys(images)),  # Remover duplicatas (mantendo a ordem)
                 'seller_feedback': self._extract_text(soup, '.mbg-nw'),
                 'return_policy': self._extract_text(soup, '.u-flL.condText')
             }
@@ -13,12 +13,44 @@ import asyncio
 from typing import List, Dict, Optional, Any
 from urllib.parse import urlencode
 
-from .base_scraper import BaseScraper
-from utils.helpers import clean_text, format_price, extract_rating, extract_number
+import soupsieve as sv
+
+from .base_scraper import (
+    BaseScraper, DETAILS_CACHE_SIZE, DETAILS_CACHE_TTL, _class_strainer, _index_by_class, _first_by_class, _json_price
+)
+from utils.helpers import async_lru_cache, clean_text, format_price, extract_rating, extract_number
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Seletores compilados uma única vez (evita reparsear o CSS a cada produto)
+_PRODUCT_SELECTORS = tuple(sv.compile(s) for s in (
+    '.ui-search-result',
+    '.results-item',
+    '.item'
+))
+# Apenas os contêineres de resultado (mesmas classes de _PRODUCT_SELECTORS)
+# viram árvore no parsing.
+_RESULTS_STRAINER = _class_strainer('ui-search-result', 'results-item', 'item')
+# Os seletores de classe simples (.ui-search-item__title, .price-tag-amount,
+# .item__seller, ...) são resolvidos pelo índice de classes montado em uma
+# única passada; as tuplas abaixo cobrem os seletores compostos/fallbacks.
+_URL_SELECTORS = tuple(sv.compile(s) for s in (
+    '.ui-search-item__group__element a',
+    'a.ui-search-item__group__element',
+    '.item__title a',
+    'a[href*="/MLB-"]'
+))
+_PRICE_SELECTORS = tuple(sv.compile(s) for s in (
+    '.ui-search-price__second-line .price-tag-amount',
+    '.item__price'
+))
+_IMAGE_SELECTORS = tuple(sv.compile(s) for s in (
+    '.ui-search-result-image__element img',
+    '.item__image img'
+))
+_TITLE_FALLBACK_SELECTOR = sv.compile('h2 a')
+
 
 class MercadoLivreScraper(BaseScraper):
     """
@@ -32,6 +64,15 @@ class MercadoLivreScraper(BaseScraper):
     - Vendedor
     """
     
+    # Contêineres de resultado, um seletor por layout
+    PRODUCT_SELECTORS = _PRODUCT_SELECTORS
+    
+    # Resultados no JSON __NEXT_DATA__ das páginas de busca
+    JSON_RESULT_PATHS = (
+        ('props', 'pageProps', 'initialState', 'results'),
+        ('initialState', 'pageState', 'results'),
+    )
+    
     def __init__(self, settings: Any):
         """
         Inicializa o scraper do Mercado Livre.
@@ -43,6 +84,7 @@ class MercadoLivreScraper(BaseScraper):
         
         self.base_url = getattr(settings, 'mercadolivre_base_url', 'https://www.mercadolivre.com.br')
         self.search_url = getattr(settings, 'mercadolivre_search_url', 'https://lista.mercadolivre.com.br')
+        self.pages_per_second = getattr(settings, 'mercadolivre_rate_limit', 4.0)
         
         # Configurar headers específicos do ML
         self._setup_ml_headers()
@@ -51,7 +93,7 @@ class MercadoLivreScraper(BaseScraper):
     
     def _setup_ml_headers(self):
         """Configura headers específicos para Mercado Livre."""
-        self.session.headers.update({
+        self.headers.update({
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
             'Cache-Control': 'no-cache',
@@ -79,52 +121,23 @@ class MercadoLivreScraper(BaseScraper):
         """
         logger.info(f"Buscando produtos no Mercado Livre: '{search_term}'")
         
-        products = []
-        page = 1
         max_results = filters.get('max_results', 50)
         
-        while len(products) < max_results:
-            try:
-                # Construir URL de busca
-                search_url = f"{self.search_url}/{search_term.replace(' ', '-')}"
-                
-                # Parâmetros
-                params = {}
-                
-                if page > 1:
-                    params['_from'] = (page - 1) * 50 + 1
-                
-                # Filtros de preço
-                if 'min_price' in filters or 'max_price' in filters:
-                    price_filter = self._build_price_filter(filters)
-                    if price_filter:
-                        params.update(price_filter)
-                
-                # Fazer requisição
-                response = await self._make_request(search_url, params)
-                if not response:
-                    break
-                
-                # Parse da página
-                soup = self._parse_html(response.text)
-                page_products = self._extract_products_from_page(soup)
-                
-                if not page_products:
-                    logger.info(f"Nenhum produto encontrado na página {page}")
-                    break
-                
-                products.extend(page_products)
-                logger.info(f"Página {page}: {len(page_products)} produtos encontrados")
-                
-                page += 1
-                
-                # Evitar muitas páginas
-                if page > 10:
-                    break
-                    
-            except Exception as e:
-                logger.error(f"Erro na página {page}: {e}")
-                break
+        # URL e filtros fixos da busca; só o deslocamento (_from) muda
+        search_url = f"{self.search_url}/{search_term.replace(' ', '-')}"
+        base_params = {}
+        if 'min_price' in filters or 'max_price' in filters:
+            base_params.update(self._build_price_filter(filters))
+        
+        def page_request(page: int):
+            if page > 1:
+                return search_url, {**base_params, '_from': (page - 1) * 50 + 1}
+            return search_url, base_params
+        
+        # Apenas os contêineres de resultado viram árvore no parsing
+        products = await self._search_pages(
+            page_request, max_results, parse_only=_RESULTS_STRAINER, filters=filters
+        )
         
         # Aplicar filtros
         filtered_products = self._apply_filters(products, **filters)
@@ -147,165 +160,142 @@ class MercadoLivreScraper(BaseScraper):
         
         return price_params
     
-    def _extract_products_from_page(self, soup) -> List[Dict[str, Any]]:
-        """Extrai produtos de uma página de resultados."""
-        products = []
-        
-        # Seletores para diferentes layouts do ML
-        selectors = [
-            '.ui-search-result',
-            '.results-item',
-            '.item'
-        ]
-        
-        product_elements = []
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                product_elements = elements
-                break
-        
-        logger.debug(f"Encontrados {len(product_elements)} elementos de produto")
+    def _product_from_json(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Converte um resultado do JSON embutido do Mercado Livre em produto."""
+        title = clean_text(item.get('title') or '')
+        if not title:
+            return None
         
-        for element in product_elements:
-            try:
-                product = self._parse_product_element(element, self.base_url)
-                if product and self._validate_product(product):
-                    products.append(product)
-            except Exception as e:
-                logger.debug(f"Erro ao processar elemento: {e}")
-                continue
+        price = _json_price(item.get('price'))
+        original_price = _json_price(item.get('original_price'))
+        shipping = item.get('shipping') if isinstance(item.get('shipping'), dict) else {}
+        seller = item.get('seller') if isinstance(item.get('seller'), dict) else {}
+        address = item.get('address') if isinstance(item.get('address'), dict) else {}
+        condition = item.get('condition') or ''
         
-        return products
+        return {
+            'title': title,
+            'price': price,
+            'original_price': original_price if original_price > price else None,
+            'discount_percent': round((1 - price / original_price) * 100) if original_price > price else 0,
+            'url': item.get('permalink') or '',
+            'image_url': item.get('thumbnail') or '',
+            'rating': 0.0,
+            'num_reviews': 0,
+            'free_shipping': bool(shipping.get('free_shipping')),
+            'mercado_envios': bool(shipping.get('logistic_type')),
+            'seller': seller.get('nickname', ''),
+            'location': address.get('state_name', ''),
+            'is_leader': False,
+            'condition': 'Novo' if condition == 'new' else 'Usado' if condition == 'used' else '',
+            'installments': '',
+            'site': 'Mercado Livre',
+            'currency': 'BRL'
+        }
+    
+    def _extract_item_price(self, element, classes=None) -> float:
+        """Extrai o preço de um elemento de produto do Mercado Livre."""
+        price = 0.0
+        if classes is not None:
+            node = _first_by_class(classes, 'price-tag-amount')
+        else:
+            node = element.find(class_='price-tag-amount')
+        if node is not None:
+            price = self._extract_price(node)
+        if price <= 0:
+            for selector in _PRICE_SELECTORS:
+                price = self._extract_price(element, selector)
+                if price > 0:
+                    break
+        return price
     
     def _parse_product_element(self, element, base_url: str) -> Optional[Dict[str, Any]]:
         """Faz parsing de um elemento de produto do Mercado Livre."""
         try:
+            # Índice de classes: uma única travessia da subárvore
+            classes = _index_by_class(element.find_all(True))
+            
             # Título
-            title_selectors = [
-                '.ui-search-item__title',
-                '.item__title',
-                'h2 a'
-            ]
-            title = ""
-            for selector in title_selectors:
-                title = self._extract_text(element, selector)
-                if title:
-                    break
+            title = self._extract_text_by_class(classes, 'ui-search-item__title', 'item__title')
+            if not title:
+                title = self._extract_text(element, _TITLE_FALLBACK_SELECTOR)
             
             if not title:
                 return None
             
             # URL
-            url_selectors = [
-                '.ui-search-item__group__element a',
-                '.item__title a',
-                'a[href*="/MLB-"]'
-            ]
             url = ""
-            for selector in url_selectors:
+            for selector in _URL_SELECTORS:
                 url = self._extract_url(element, selector, base_url=base_url)
                 if url:
                     break
             
             # Preço
-            price_selectors = [
-                '.price-tag-amount',
-                '.ui-search-price__second-line .price-tag-amount',
-                '.item__price'
-            ]
-            price = 0.0
-            for selector in price_selectors:
-                price = self._extract_price(element, selector)
-                if price > 0:
-                    break
+            price = self._extract_item_price(element, classes)
             
             # Preço original (se em desconto)
-            original_price_selectors = [
-                '.ui-search-price__original-value',
-                '.item__discount-price'
-            ]
             original_price = 0.0
-            for selector in original_price_selectors:
-                original_price = self._extract_price(element, selector)
-                if original_price > 0:
-                    break
+            for css_class in ('ui-search-price__original-value', 'item__discount-price'):
+                node = _first_by_class(classes, css_class)
+                if node is not None:
+                    original_price = self._extract_price(node)
+                    if original_price > 0:
+                        break
             
             # Desconto
-            discount_text = self._extract_text(element, '.ui-search-price__discount')
+            discount_text = self._extract_text_by_class(classes, 'ui-search-price__discount')
             discount_percent = 0
             if discount_text:
                 discount_percent = extract_number(discount_text)
             
             # Frete grátis
-            free_shipping = bool(
-                element.select('.ui-search-item__shipping') and
-                'grátis' in self._extract_text(element, '.ui-search-item__shipping').lower()
-            )
+            shipping_text = self._extract_text_by_class(classes, 'ui-search-item__shipping')
+            free_shipping = 'grátis' in shipping_text.lower()
             
             # Mercado Envios
-            mercado_envios = bool(element.select('.ui-search-item__shipping-label'))
+            mercado_envios = 'ui-search-item__shipping-label' in classes
             
             # Vendedor
-            seller_selectors = [
-                '.ui-search-item__group__element--seller',
-                '.item__seller'
-            ]
-            seller = ""
-            for selector in seller_selectors:
-                seller = self._extract_text(element, selector)
-                if seller:
-                    break
+            seller = self._extract_text_by_class(classes, 'ui-search-item__group__element--seller', 'item__seller')
             
             # Localização
-            location = self._extract_text(element, '.ui-search-item__group__element--location')
+            location = self._extract_text_by_class(classes, 'ui-search-item__group__element--location')
             
             # Avaliação
-            rating_selectors = [
-                '.ui-search-reviews__rating-number',
-                '.item__reviews-rating'
-            ]
             rating = 0.0
-            for selector in rating_selectors:
-                rating_text = self._extract_text(element, selector)
+            for css_class in ('ui-search-reviews__rating-number', 'item__reviews-rating'):
+                rating_text = self._extract_text_by_class(classes, css_class)
                 if rating_text:
                     rating = extract_rating(rating_text)
                     if rating > 0:
                         break
             
             # Número de avaliações
-            reviews_selectors = [
-                '.ui-search-reviews__amount',
-                '.item__reviews-total'
-            ]
             num_reviews = 0
-            for selector in reviews_selectors:
-                reviews_text = self._extract_text(element, selector)
+            for css_class in ('ui-search-reviews__amount', 'item__reviews-total'):
+                reviews_text = self._extract_text_by_class(classes, css_class)
                 if reviews_text:
                     num_reviews = extract_number(reviews_text)
                     if num_reviews > 0:
                         break
             
             # Imagem
-            image_selectors = [
-                '.ui-search-result-image__element img',
-                '.item__image img'
-            ]
             image_url = ""
-            for selector in image_selectors:
+            for selector in _IMAGE_SELECTORS:
                 image_url = self._extract_image_url(element, selector, base_url)
                 if image_url:
                     break
             
             # Mercado Líder
-            is_leader = bool(element.select('.ui-search-item__group__element--leader'))
+            is_leader = 'ui-search-item__group__element--leader' in classes
             
             # Condição (novo/usado)
-            condition_text = self._extract_text(element, '.ui-search-item__group__element--condition')
-            condition = 'Novo' if 'novo' in condition_text.lower() else 'Usado' if 'usado' in condition_text.lower() else ''
+            condition_text = self._extract_text_by_class(classes, 'ui-search-item__group__element--condition')
+            condition_lower = condition_text.lower()
+            condition = 'Novo' if 'novo' in condition_lower else 'Usado' if 'usado' in condition_lower else ''
             
             # Parcelamento
-            installments_text = self._extract_text(element, '.ui-search-item__group__element--installments')
+            installments_text = self._extract_text_by_class(classes, 'ui-search-item__group__element--installments')
             
             product = {
                 'title': title,
@@ -330,9 +320,11 @@ class MercadoLivreScraper(BaseScraper):
             return product
             
         except Exception as e:
-            logger.debug(f"Erro ao fazer parse do produto ML: {e}")
+            logger.debug("Erro ao fazer parse do produto ML: {}", e)
             return None
     
+    @async_lru_cache(maxsize=DETAILS_CACHE_SIZE, ttl=DETAILS_CACHE_TTL,
+                     key=lambda self, product_url: (type(self), product_url))
     async def get_product_details(self, product_url: str) -> Optional[Dict[str, Any]]:
         """
         Obtém detalhes adicionais de um produto específico do Mercado Livre.
@@ -348,7 +340,7 @@ class MercadoLivreScraper(BaseScraper):
             if not response:
                 return None
             
-            soup = self._parse_html(response.text)
+            soup = self._parse_html(response.content)
             
             # Descrição
             description_selectors = [
@@ -390,7 +382,7 @@ class MercadoLivreScraper(BaseScraper):
             return {
                 'detailed_description': description,
                 'specifications': specs,
-                'images': list(set(images)),
+                'images': list(dict.fromkeys(images)),  # Remover duplicatas (mantendo a ordem)
                 'seller_info': seller_info,
                 'warranty': self._extract_text(soup, '.ui-pdp-warranty'),
                 'return_policy': self._extract_text(soup, '.ui-pdp-returns')
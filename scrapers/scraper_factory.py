@@ -2,16 +2,33 @@
 Factory para criação de scrapers específicos por site.
 """
 
-from typing import Optional
+from __future__ import annotations
+
+import functools
+import importlib
+import sys
+from typing import Optional, TYPE_CHECKING
 from config.settings import Settings
-from .base_scraper import BaseScraper
-from .amazon_scraper import AmazonScraper
-from .ebay_scraper import EbayScraper
-from .mercadolivre_scraper import MercadoLivreScraper
 from utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    from .base_scraper import BaseScraper
+
 logger = setup_logger(__name__)
 
+__all__ = ["ScraperFactory", "create_scraper", "get_supported_sites"]
+
+
+@functools.lru_cache(maxsize=128)
+def _norm(site: str) -> str:
+    """
+    Normaliza o nome do site (minúsculas, sem espaços nas pontas).
+    
+    O resultado é internado, como as chaves literais de _scrapers: a busca
+    no dicionário compara por identidade antes de comparar o conteúdo.
+    """
+    return sys.intern(site.lower().strip())
+
 
 class ScraperFactory:
     """
@@ -21,15 +38,41 @@ class ScraperFactory:
     o código cliente.
     """
     
-    # Mapeamento de sites para classes de scraper
+    # Mapeamento de sites para classes de scraper. As classes nativas são
+    # registradas como (módulo, classe) e importadas só no primeiro uso
     _scrapers = {
-        'amazon': AmazonScraper,
-        'ebay': EbayScraper,
-        'mercadolivre': MercadoLivreScraper,
-        'mercado_livre': MercadoLivreScraper,  # Alias
-        'ml': MercadoLivreScraper,  # Alias
+        'amazon': ('scrapers.amazon_scraper', 'AmazonScraper'),
+        'ebay': ('scrapers.ebay_scraper', 'EbayScraper'),
+        'mercadolivre': ('scrapers.mercadolivre_scraper', 'MercadoLivreScraper'),
+        'mercado_livre': ('scrapers.mercadolivre_scraper', 'MercadoLivreScraper'),  # Alias
+        'ml': ('scrapers.mercadolivre_scraper', 'MercadoLivreScraper'),  # Alias
     }
     
+    # Nomes suportados, para consultas rápidas (refeito em register_scraper)
+    _supported = frozenset(_scrapers)
+    _supported_tuple = tuple(_scrapers)
+    
+    # Resultado de get_scraper_info (refeito apenas após register_scraper)
+    _info_cache: Optional[dict] = None
+    
+    @classmethod
+    def _resolve(cls, site: str, entry) -> type:
+        """
+        Retorna a classe de scraper do site, importando o módulo se necessário.
+        
+        Args:
+            site: Nome do site já normalizado
+            entry: Valor registrado em _scrapers para o site
+            
+        Returns:
+            Classe do scraper
+        """
+        if isinstance(entry, tuple):
+            module_name, class_name = entry
+            entry = getattr(importlib.import_module(module_name), class_name)
+            cls._scrapers[site] = entry
+        return entry
+    
     @classmethod
     def create_scraper(cls, site: str, settings: Settings) -> Optional[BaseScraper]:
         """
@@ -45,34 +88,30 @@ class ScraperFactory:
         Raises:
             ValueError: Se o site não for suportado
         """
-        site_lower = site.lower().strip()
+        site_lower = _norm(site)
+        entry = cls._scrapers.get(site_lower)
         
-        if site_lower not in cls._scrapers:
-            available_sites = ', '.join(cls._scrapers.keys())
+        if entry is None:
+            available_sites = ', '.join(cls._supported_tuple)
             raise ValueError(
                 f"Site '{site}' não suportado. Sites disponíveis: {available_sites}"
             )
         
-        scraper_class = cls._scrapers[site_lower]
+        scraper_class = cls._resolve(site_lower, entry)
         
-        try:
-            scraper = scraper_class(settings)
-            logger.info(f"Scraper criado com sucesso: {scraper_class.__name__}")
-            return scraper
-            
-        except Exception as e:
-            logger.error(f"Erro ao criar scraper para {site}: {e}")
-            raise
+        scraper = scraper_class(settings)
+        logger.info(f"Scraper criado com sucesso: {scraper_class.__name__}")
+        return scraper
     
     @classmethod
-    def get_supported_sites(cls) -> list:
+    def get_supported_sites(cls) -> tuple:
         """
-        Retorna lista de sites suportados.
+        Retorna os sites suportados.
         
         Returns:
-            Lista de nomes de sites suportados
+            Tupla (imutável, compartilhada) com os nomes de sites suportados
         """
-        return list(cls._scrapers.keys())
+        return cls._supported_tuple
     
     @classmethod
     def register_scraper(cls, site: str, scraper_class: type):
@@ -86,10 +125,15 @@ class ScraperFactory:
         Raises:
             TypeError: Se scraper_class não herda de BaseScraper
         """
+        from .base_scraper import BaseScraper
+        
         if not issubclass(scraper_class, BaseScraper):
             raise TypeError("Scraper deve herdar de BaseScraper")
         
-        cls._scrapers[site.lower()] = scraper_class
+        cls._scrapers[_norm(site)] = scraper_class
+        cls._supported = frozenset(cls._scrapers)
+        cls._supported_tuple = tuple(cls._scrapers)
+        cls._info_cache = None
         logger.info(f"Scraper registrado: {site} -> {scraper_class.__name__}")
     
     @classmethod
@@ -103,7 +147,7 @@ class ScraperFactory:
         Returns:
             True se suportado
         """
-        return site.lower().strip() in cls._scrapers
+        return _norm(site) in cls._supported
     
     @classmethod
     def get_scraper_info(cls) -> dict:
@@ -113,13 +157,21 @@ class ScraperFactory:
         Returns:
             Dicionário com informações dos scrapers
         """
+        if cls._info_cache is not None:
+            return cls._info_cache
+        
         info = {}
+        by_class = {}  # Aliases reutilizam as informações da mesma classe
+        temp_settings = Settings()
         
-        for site, scraper_class in cls._scrapers.items():
+        for site, entry in list(cls._scrapers.items()):
+            scraper_class = cls._resolve(site, entry)
+            if scraper_class in by_class:
+                info[site] = by_class[scraper_class]
+                continue
+            
             try:
                 # Criar instância temporária para obter informações
-                from config.settings import Settings
-                temp_settings = Settings()
                 temp_scraper = scraper_class(temp_settings)
                 
                 info[site] = {
@@ -134,7 +186,10 @@ class ScraperFactory:
                     'class_name': scraper_class.__name__,
                     'error': str(e)
                 }
+            
+            by_class[scraper_class] = info[site]
         
+        cls._info_cache = info
         return info
 
 
@@ -154,11 +209,11 @@ def create_scraper(site: str, settings: Settings) -> BaseScraper:
 
 
 # Função para listar sites suportados
-def get_supported_sites() -> list:
+def get_supported_sites() -> tuple:
     """
     Função de conveniência para obter sites suportados.
     
     Returns:
-        Lista de sites suportados
+        Tupla de sites suportados
     """
     return ScraperFactory.get_supported_sites()
@@ -7,6 +7,7 @@ do sistema de web scraping.
 
 Testes disponíveis:
 - test_scrapers.py: Testes para scrapers
+- test_helpers.py: Testes para funções utilitárias
 - test_database.py: Testes para banco de dados
 - test_email.py: Testes para sistema de e-mail
 """
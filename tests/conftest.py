@@ -0,0 +1,72 @@
+"""
+Configuração Compartilhada dos Testes
+=====================================
+
+Fixtures disponíveis para todos os módulos de teste.
+
+Autor: Seu Nome
+Data: 2025-09-20
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+# Adicionar o diretório raiz ao path (uma vez, antes da coleta dos testes)
+ROOT_DIR = str(Path(__file__).parent.parent)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from config.settings import Settings
+
+
+@pytest.fixture(scope="session")
+def settings():
+    """Configurações do sistema, criadas uma única vez por sessão de testes."""
+    return Settings()
+
+
+@pytest.fixture(scope="session")
+def make_response():
+    """Fábrica de respostas HTTP simuladas (text, content e status_code)."""
+    def _make_response(html, status_code=200):
+        response = Mock()
+        response.text = html
+        response.content = html.encode('utf-8')
+        response.status_code = status_code
+        return response
+    
+    return _make_response
+
+
+def pytest_addoption(parser):
+    """Opções de linha de comando dos testes."""
+    parser.addoption(
+        "--integration", action="store_true", default=False,
+        help="Executa também os testes de integração (acessam os sites reais)"
+    )
+
+
+def pytest_configure(config):
+    """Configuração do pytest."""
+    config.addinivalue_line(
+        "markers", "integration: marca testes de integração"
+    )
+    config.addinivalue_line(
+        "markers", "slow: marca testes lentos"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Modifica coleção de testes."""
+    # Com --integration nada a fazer: a coleção não é percorrida
+    if config.getoption("--integration"):
+        return
+    
+    # Pular testes de integração por padrão
+    skip_integration = pytest.mark.skip(reason="Teste de integração desabilitado")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_integration)
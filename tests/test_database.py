@@ -0,0 +1,114 @@
+"""
+Testes para o Banco de Dados
+============================
+
+Testes do DatabaseManager sobre um SQLite temporário,
+incluindo a busca em lote de produtos existentes.
+
+Autor: Seu Nome
+Data: 2025-09-20
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+from database import DatabaseManager, Product
+
+
+def _product(n, **overrides):
+    """Dados mínimos de um produto do Mercado Livre."""
+    data = {
+        'title': f'Produto {n}',
+        'url': f'https://example.com/p/{n}',
+        'site': 'mercadolivre',
+        'external_id': f'MLB{n}',
+        'price': 100.0 + n,
+    }
+    data.update(overrides)
+    return data
+
+
+@pytest.fixture
+def db(tmp_path):
+    """DatabaseManager inicializado sobre um arquivo SQLite temporário."""
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    asyncio.run(manager.initialize())
+    yield manager
+    manager.engine.dispose()
+
+
+def _count_products(db):
+    with db.get_session() as session:
+        return session.query(Product).count()
+
+
+class TestSaveProducts:
+    """
+    Testes para DatabaseManager.save_products.
+    """
+    
+    @pytest.mark.asyncio
+    async def test_large_batch_is_chunked(self, db):
+        """Lotes grandes são buscados em blocos, sem duplicar no re-save."""
+        products = [_product(n) for n in range(1200)]
+        await db.save_products(products)
+        
+        max_params = []
+        
+        def track(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                max_params.append(len(parameters))
+        
+        event.listen(db.engine, 'before_cursor_execute', track)
+        try:
+            await db.save_products([_product(n, price=1.0) for n in range(1200)])
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', track)
+        
+        assert _count_products(db) == 1200
+        assert max(max_params) <= 500
+        with db.get_session() as session:
+            assert {p.current_price for p in session.query(Product)} == {1.0}
+    
+    @pytest.mark.asyncio
+    async def test_small_chunks_find_all_existing(self, db):
+        """Produtos espalhados em vários blocos continuam encontrados."""
+        await db.save_products([_product(n) for n in range(7)])
+        
+        with patch('database.database._IN_CHUNK_SIZE', 2):
+            await db.save_products([_product(n) for n in range(7)])
+        
+        assert _count_products(db) == 7
+    
+    @pytest.mark.asyncio
+    async def test_url_takes_precedence_over_external_id(self, db):
+        """A URL decide o produto antes do (site, ID externo)."""
+        await db.save_products([_product(1), _product(2)])
+        
+        # URL do produto 2 com o ID externo do produto 1: atualiza o 2
+        await db.save_products([_product(2, external_id='MLB1', price=5.0)])
+        # URL nova com o ID externo do produto 1: atualiza o 1
+        await db.save_products([
+            _product(3, url='https://example.com/p/novo', external_id='MLB1', price=7.0)
+        ])
+        
+        with db.get_session() as session:
+            prices = {p.url: p.current_price for p in session.query(Product)}
+        
+        assert prices == {
+            'https://example.com/p/1': 7.0,
+            'https://example.com/p/2': 5.0,
+        }
+    
+    @pytest.mark.asyncio
+    async def test_external_id_matches_only_same_site(self, db):
+        """O mesmo ID externo em outro site cria um produto novo."""
+        await db.save_products([_product(1)])
+        await db.save_products([
+            _product(1, url='https://example.com/outro', site='ebay')
+        ])
+        
+        assert _count_products(db) == 2
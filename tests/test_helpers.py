@@ -0,0 +1,235 @@
+"""
+Testes para Funções Utilitárias
+===============================
+
+Testes unitários dos decorators e funções de formatação
+de utils.helpers.
+
+Autor: Seu Nome
+Data: 2025-09-20
+"""
+
+import asyncio
+import time
+from unittest.mock import patch, AsyncMock, MagicMock
+
+import pytest
+
+from utils.helpers import (
+    async_lru_cache, clean_text, clean_text_batch, format_price, format_price_batch,
+    rate_limit, retry, token_bucket,
+)
+
+
+class TestRateLimit:
+    """
+    Testes para o token bucket de rate_limit.
+    """
+    
+    def test_burst_passes_without_waiting(self):
+        """Até `calls` chamadas seguidas não esperam."""
+        reserve = token_bucket(calls=3, period=0.3)
+        
+        assert [reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    
+    def test_next_caller_waits_period_over_calls(self):
+        """Depois da rajada, cada chamada espera period/calls a mais."""
+        reserve = token_bucket(calls=3, period=0.3)
+        for _ in range(3):
+            reserve()
+        
+        assert reserve() == pytest.approx(0.1, abs=0.02)
+        assert reserve() == pytest.approx(0.2, abs=0.02)
+    
+    def test_sync_wrapper_sleeps_after_burst(self):
+        """O decorator em função síncrona dorme só depois da rajada."""
+        @rate_limit(calls=2, period=0.2)
+        def call():
+            return time.monotonic()
+        
+        start = time.monotonic()
+        times = [call() - start for _ in range(3)]
+        
+        assert times[1] < 0.05
+        assert times[2] == pytest.approx(0.1, abs=0.05)
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_get_increasing_slots(self):
+        """Corrotinas em asyncio.gather recebem vagas crescentes."""
+        @rate_limit(calls=2, period=0.2)
+        async def call():
+            return None
+        
+        with patch('utils.helpers.asyncio.sleep', new=AsyncMock()) as sleep:
+            await asyncio.gather(*(call() for _ in range(6)))
+        
+        # Duas chamadas da rajada não dormem; as outras quatro esperam
+        # 0.1, 0.2, 0.3 e 0.4 s (uma ficha a cada period/calls)
+        waits = sorted(c.args[0] for c in sleep.call_args_list)
+        assert waits == pytest.approx([0.1, 0.2, 0.3, 0.4], abs=0.02)
+    
+    def test_period_accepts_fractions(self):
+        """period fracionário (ritmos acima de 1 chamada/s) é aceito."""
+        reserve = token_bucket(calls=1, period=0.25)
+        reserve()
+        
+        assert reserve() == pytest.approx(0.25, abs=0.02)
+
+
+class TestFormatPrice:
+    """
+    Testes para format_price com separadores de BRL e USD.
+    """
+    
+    @pytest.mark.parametrize("text, expected", [
+        ("1.999,90", 1999.90),
+        ("R$ 1.234,56", 1234.56),
+        ("12,5", 12.5),
+        ("0,99", 0.99),
+        ("1.999", 1999.0),
+        ("1.234.567", 1234567.0),
+        ("1,299.99", 1299.99),
+        ("$1,234,567.89", 1234567.89),
+        ("US $ 49.99", 49.99),
+        ("1,299", 1299.0),
+    ])
+    def test_thousands_and_decimal_separators(self, text, expected):
+        """Milhar e decimal são reconhecidos nos dois formatos."""
+        assert format_price(text) == pytest.approx(expected)
+    
+    @pytest.mark.parametrize("text", ["", "abc", None])
+    def test_invalid_returns_zero(self, text):
+        """Texto sem preço vira 0.0."""
+        assert format_price(text) == 0.0
+
+
+# Textos mistos: BRL, USD, faixas, espaços unicode, aspas e lixo
+MIXED_TEXTS = [
+    "R$ 1.999,90",
+    "$1,299.99",
+    "12,5",
+    "0,99",
+    "1.234.567",
+    "1,299",
+    "US $ 49.99 to US $ 59.99",
+    "  Notebook\u00a0Gamer\n\t 16GB  ",
+    "\u201cFone\u201d \u2018Bluetooth\u2019",
+    "",
+    "sem preço",
+    None,
+]
+
+
+class TestBatchEquivalence:
+    """
+    Testes de equivalência entre as versões vetorizadas e as escalares.
+    """
+    
+    def test_format_price_batch_matches_scalar(self):
+        """format_price_batch devolve o mesmo que format_price por item."""
+        pd = pytest.importorskip("pandas")
+        
+        result = format_price_batch(pd.Series(MIXED_TEXTS, dtype=object))
+        
+        assert result.tolist() == [format_price(t) for t in MIXED_TEXTS]
+    
+    def test_clean_text_batch_matches_scalar(self):
+        """clean_text_batch devolve o mesmo que clean_text por item."""
+        pd = pytest.importorskip("pandas")
+        
+        result = clean_text_batch(pd.Series(MIXED_TEXTS, dtype=object))
+        
+        assert result.tolist() == [clean_text(t) for t in MIXED_TEXTS]
+
+
+class TestRetry:
+    """
+    Testes para o backoff do decorator retry.
+    """
+    
+    @pytest.mark.asyncio
+    async def test_delays_never_exceed_max_delay(self):
+        """Com jitter, cada espera é sorteada em [0, delay] e delay <= max_delay."""
+        failing = AsyncMock(side_effect=ValueError("falha"))
+        call = retry(max_attempts=8, delay=1.0, backoff=3.0, max_delay=5.0)(failing)
+        
+        with patch('utils.helpers.asyncio.sleep', new=AsyncMock()) as sleep, \
+                patch('utils.helpers.random.uniform', side_effect=lambda a, b: b) as uniform:
+            with pytest.raises(ValueError):
+                await call()
+        
+        assert failing.await_count == 8
+        assert [c.args for c in uniform.call_args_list] == [
+            (0, 1.0), (0, 3.0), (0, 5.0), (0, 5.0), (0, 5.0), (0, 5.0), (0, 5.0)
+        ]
+        assert all(c.args[0] <= 5.0 for c in sleep.call_args_list)
+    
+    def test_sync_without_jitter_is_capped(self):
+        """Sem jitter, a espera síncrona é o delay exponencial com teto."""
+        failing = MagicMock(side_effect=ValueError("falha"))
+        call = retry(max_attempts=5, delay=2.0, backoff=2.0, max_delay=5.0, jitter=False)(failing)
+        
+        with patch('utils.helpers.time.sleep') as sleep:
+            with pytest.raises(ValueError):
+                call()
+        
+        assert [c.args[0] for c in sleep.call_args_list] == [2.0, 4.0, 5.0, 5.0]
+    
+    def test_initial_delay_above_max_is_capped(self):
+        """Um delay inicial maior que max_delay já começa no teto."""
+        failing = MagicMock(side_effect=ValueError("falha"))
+        call = retry(max_attempts=2, delay=60.0, max_delay=5.0, jitter=False)(failing)
+        
+        with patch('utils.helpers.time.sleep') as sleep:
+            with pytest.raises(ValueError):
+                call()
+        
+        sleep.assert_called_once_with(5.0)
+
+
+class TestAsyncLruCache:
+    """
+    Testes para o decorator async_lru_cache.
+    """
+    
+    @pytest.mark.asyncio
+    async def test_hit_skips_call_and_returns_copy(self):
+        """Acerto não chama a função e devolve uma cópia independente."""
+        fetch = AsyncMock(return_value={'title': 'Produto', 'images': ['a.jpg']})
+        cached = async_lru_cache(maxsize=4)(fetch)
+        
+        first = await cached('url')
+        first['title'] = 'alterado'
+        first['images'].append('b.jpg')
+        second = await cached('url')
+        second['images'].clear()
+        third = await cached('url')
+        
+        assert fetch.await_count == 1
+        assert third == {'title': 'Produto', 'images': ['a.jpg']}
+    
+    @pytest.mark.asyncio
+    async def test_entry_expires_after_ttl(self):
+        """Depois do ttl a função é chamada de novo."""
+        fetch = AsyncMock(return_value={'price': 10.0})
+        cached = async_lru_cache(maxsize=4, ttl=60)(fetch)
+        
+        now = [0.0]
+        with patch('utils.helpers.time.monotonic', side_effect=lambda: now[0]):
+            await cached('url')
+            now[0] = 30.0
+            await cached('url')
+            now[0] = 61.0
+            await cached('url')
+        
+        assert fetch.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_none_is_not_cached(self):
+        """Resultado None não entra no cache."""
+        fetch = AsyncMock(side_effect=[None, {'price': 10.0}])
+        cached = async_lru_cache(maxsize=4)(fetch)
+        
+        assert await cached('url') is None
+        assert await cached('url') == {'price': 10.0}
+        assert fetch.await_count == 2
@@ -10,17 +10,42 @@ Módulos disponíveis:
 - logger: Sistema de logging
 """
 
-from .helpers import rate_limit, retry, clean_text, format_price
-from .logger import setup_logger, log_email_sent
+import importlib
+
+# Funções importadas sob demanda (ver __getattr__): importar utils.logger
+# não carrega utils.helpers, e vice-versa
+_LAZY_IMPORTS = {
+    "rate_limit": ".helpers",
+    "token_bucket": ".helpers",
+    "retry": ".helpers",
+    "clean_text": ".helpers",
+    "format_price": ".helpers",
+    "clean_text_batch": ".helpers",
+    "format_price_batch": ".helpers",
+    "setup_logger": ".logger",
+    "log_email_sent": ".logger",
+}
 
 __all__ = [
     "rate_limit",
+    "token_bucket",
     "retry", 
     "clean_text",
     "format_price",
+    "clean_text_batch",
+    "format_price_batch",
     "setup_logger",
     "log_email_sent"
 ]
 
 __version__ = "1.0.0"
 __author__ = "Seu Nome"
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
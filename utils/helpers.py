@@ -10,49 +10,112 @@ Data: 2025-09-20
 """
 
 import asyncio
+import copy
 import functools
+import random
 import re
+import threading
 import time
-from typing import Any, Callable, Optional
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Optional
+from urllib.parse import urljoin, urlparse
 import logging
 
+if TYPE_CHECKING:
+    # Só para as anotações: o pandas continua importado sob demanda
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+# Padrões compilados uma única vez
+_PRICE_STRIP_RE = re.compile(r'[^\d,.]')
+# Ponto seguido de exatamente três dígitos: separador de milhar (1.999, 12.345.678)
+_THOUSANDS_DOT_RE = re.compile(r'\.(?=\d{3}(?:\D|$))')
+_RATING_RE = re.compile(r'(\d+[.,]?\d*)')
+_NUMBER_RE = re.compile(r'(\d+)')
+_WS_RE = re.compile(r'\s+')
+_CTRL_RE = re.compile(r'[\x00-\x1f\x7f-\x9f]')
+# Caso comum de URL (http/https com autoridade ASCII simples): dispensa o
+# urlparse. Qualquer outra forma cai no urlparse, que decide como antes
+_URL_FAST_RE = re.compile(r"https?://([A-Za-z0-9._~%!$&'()*+,;=:@-]+)(?=[/?#]|\Z)")
+# \Z em vez de $: $ também aceitaria uma quebra de linha no final
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z')
+
+# Pontuação tipográfica -> ASCII (aspas retas, hífen, reticências) numa única
+# passada com translate. Novas substituições de caractere entram nesta tabela,
+# não em cadeias de replace: o custo segue uma varredura do texto
+_QUOTE_TRANS = str.maketrans({
+    '“': '"', '”': '"', '‘': "'", '’': "'",
+    '\u2013': '-', '\u2014': '-',  # travessões (en/em dash)
+    '\u2026': '...',  # reticências
+})
+_QUOTE_RE = re.compile('[' + re.escape(''.join(map(chr, _QUOTE_TRANS))) + ']')
+# Mesma tabela como (classe de caracteres, substituto) para o caminho em lote
+_QUOTE_BATCH = tuple(
+    ('[' + re.escape(''.join(chr(c) for c, r in _QUOTE_TRANS.items() if r == repl)) + ']', repl or '')
+    for repl in dict.fromkeys(_QUOTE_TRANS.values())
+)
+
+
+def token_bucket(calls: float, period: float) -> Callable[[], float]:
+    """
+    Cria um token bucket seguro entre threads e corrotinas.
+    
+    Permite rajadas de até `calls` chamadas e, em regime, `calls` chamadas
+    a cada `period` segundos. A função devolvida consome uma ficha sob um
+    lock (o saldo pode ficar negativo, enfileirando as seguintes) e retorna
+    quanto o chamador deve esperar, fora do lock, até a sua ficha ser reposta.
+    
+    Args:
+        calls: Capacidade do bucket (rajada máxima)
+        period: Período em segundos para repor `calls` fichas
+        
+    Returns:
+        Função sem argumentos que reserva uma ficha e retorna a espera em segundos
+    """
+    rate = calls / period
+    lock = threading.Lock()
+    bucket = {'tokens': float(calls), 'last': time.monotonic()}
+    
+    def reserve() -> float:
+        """Consome uma ficha e retorna a espera até ela estar disponível."""
+        with lock:
+            now = time.monotonic()
+            tokens = min(calls, bucket['tokens'] + (now - bucket['last']) * rate) - 1
+            bucket['tokens'] = tokens
+            bucket['last'] = now
+        return -tokens / rate if tokens < 0 else 0.0
+    
+    return reserve
+
 
-def rate_limit(calls: int = 1, period: int = 1):
+def rate_limit(calls: int = 1, period: float = 1):
     """
-    Decorator para implementar rate limiting.
+    Decorator para implementar rate limiting (token bucket).
+    
+    Permite rajadas de até `calls` chamadas e, em regime, `calls` chamadas
+    a cada `period` segundos (ver token_bucket).
     
     Args:
         calls: Número de chamadas permitidas
         period: Período em segundos
     """
     def decorator(func: Callable) -> Callable:
-        last_called = [0.0]
+        reserve = token_bucket(calls, period)
         
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            elapsed = time.time() - last_called[0]
-            left_to_wait = period - elapsed
-            
-            if left_to_wait > 0:
-                await asyncio.sleep(left_to_wait)
-            
-            ret = await func(*args, **kwargs)
-            last_called[0] = time.time()
-            return ret
+            wait = reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            return await func(*args, **kwargs)
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            elapsed = time.time() - last_called[0]
-            left_to_wait = period - elapsed
-            
-            if left_to_wait > 0:
-                time.sleep(left_to_wait)
-            
-            ret = func(*args, **kwargs)
-            last_called[0] = time.time()
-            return ret
+            wait = reserve()
+            if wait > 0:
+                time.sleep(wait)
+            return func(*args, **kwargs)
         
         if asyncio.iscoroutinefunction(func):
             return async_wrapper
@@ -62,7 +125,8 @@ def rate_limit(calls: int = 1, period: int = 1):
     return decorator
 
 
-def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
+def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0,
+          max_delay: float = 30.0, jitter: bool = True):
     """
     Decorator para implementar retry automático.
     
@@ -70,12 +134,18 @@ def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
         max_attempts: Número máximo de tentativas
         delay: Delay inicial entre tentativas
         backoff: Multiplicador do delay a cada tentativa
+        max_delay: Teto do delay, por maior que seja o número de tentativas
+        jitter: Espera sorteada entre 0 e o delay ("full jitter"), para que
+            chamadas que falharam juntas não tentem de novo ao mesmo tempo
     """
+    def wait_for(current_delay: float) -> float:
+        return random.uniform(0, current_delay) if jitter else current_delay
+    
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
             last_exception = None
-            current_delay = delay
+            current_delay = min(max_delay, delay)
             
             for attempt in range(max_attempts):
                 try:
@@ -87,8 +157,8 @@ def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
                     )
                     
                     if attempt < max_attempts - 1:
-                        await asyncio.sleep(current_delay)
-                        current_delay *= backoff
+                        await asyncio.sleep(wait_for(current_delay))
+                        current_delay = min(max_delay, current_delay * backoff)
             
             logger.error(f"Todas as {max_attempts} tentativas falharam")
             raise last_exception
@@ -96,7 +166,7 @@ def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
             last_exception = None
-            current_delay = delay
+            current_delay = min(max_delay, delay)
             
             for attempt in range(max_attempts):
                 try:
@@ -108,8 +178,8 @@ def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
                     )
                     
                     if attempt < max_attempts - 1:
-                        time.sleep(current_delay)
-                        current_delay *= backoff
+                        time.sleep(wait_for(current_delay))
+                        current_delay = min(max_delay, current_delay * backoff)
             
             logger.error(f"Todas as {max_attempts} tentativas falharam")
             raise last_exception
@@ -122,6 +192,54 @@ def retry(max_attempts: int = 3, delay: float = 1.0, backoff: float = 2.0):
     return decorator
 
 
+def async_lru_cache(maxsize: int = 128, ttl: Optional[float] = None,
+                    key: Optional[Callable[..., Any]] = None):
+    """
+    Decorator de cache LRU para funções assíncronas.
+    
+    Resultados None não são armazenados, para que falhas possam ser
+    repetidas na próxima chamada. O cache guarda e devolve cópias
+    profundas, então quem altera o resultado não altera o cache.
+    
+    Args:
+        maxsize: Número máximo de entradas no cache
+        ttl: Validade das entradas em segundos (None = sem expiração)
+        key: Função que monta a chave a partir dos argumentos
+             (padrão: todos os argumentos)
+    """
+    def decorator(func: Callable) -> Callable:
+        cache: OrderedDict = OrderedDict()
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if key is not None:
+                cache_key = key(*args, **kwargs)
+            else:
+                cache_key = (args, tuple(sorted(kwargs.items())))
+            
+            entry = cache.get(cache_key)
+            if entry is not None:
+                value, stored_at = entry
+                if ttl is None or time.monotonic() - stored_at < ttl:
+                    cache.move_to_end(cache_key)
+                    return copy.deepcopy(value)
+                del cache[cache_key]
+            
+            value = await func(*args, **kwargs)
+            
+            if value is not None:
+                cache[cache_key] = (copy.deepcopy(value), time.monotonic())
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            
+            return value
+        
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    
+    return decorator
+
+
 def clean_text(text: str) -> str:
     """
     Limpa e normaliza texto.
@@ -136,14 +254,15 @@ def clean_text(text: str) -> str:
         return ""
     
     # Remover espaços extras
-    text = re.sub(r'\s+', ' ', text.strip())
+    text = _WS_RE.sub(' ', text.strip())
     
-    # Remover caracteres de controle
-    text = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', text)
+    # Remover caracteres de controle (texto imprimível não tem nenhum)
+    if not text.isprintable():
+        text = _CTRL_RE.sub('', text)
     
-    # Normalizar aspas
-    text = text.replace('“', '"').replace('”', '"')
-    text = text.replace('‘', "'").replace('’', "'")
+    # Normalizar pontuação tipográfica (texto ASCII não tem nenhuma)
+    if not text.isascii() and _QUOTE_RE.search(text):
+        text = text.translate(_QUOTE_TRANS)
     
     return text
 
@@ -162,7 +281,7 @@ def format_price(price_text: str) -> float:
         return 0.0
     
     # Remover caracteres não numéricos exceto vírgula e ponto
-    price_clean = re.sub(r'[^\d,.]', '', str(price_text))
+    price_clean = _PRICE_STRIP_RE.sub('', str(price_text))
     
     if not price_clean:
         return 0.0
@@ -170,20 +289,98 @@ def format_price(price_text: str) -> float:
     try:
         # Tratar formato brasileiro (1.234,56)
         if ',' in price_clean and '.' in price_clean:
-            # Se tem ambos, assumir formato brasileiro
+            # Se tem ambos, o último separador é o decimal
             if price_clean.rindex(',') > price_clean.rindex('.'):
                 price_clean = price_clean.replace('.', '').replace(',', '.')
+            else:
+                # Formato americano (1,299.99): vírgula é separador de milhar
+                price_clean = price_clean.replace(',', '')
         elif ',' in price_clean:
-            # Se só tem vírgula, pode ser decimal brasileiro
+            # Se só tem vírgula, pode ser decimal brasileiro (até 2 casas);
+            # caso contrário é separador de milhar (1,299)
             parts = price_clean.split(',')
             if len(parts) == 2 and len(parts[1]) <= 2:
                 price_clean = price_clean.replace(',', '.')
+            else:
+                price_clean = price_clean.replace(',', '')
+        elif '.' in price_clean:
+            # Só pontos: os que separam grupos de três dígitos são de milhar
+            price_clean = _THOUSANDS_DOT_RE.sub('', price_clean)
         
         return float(price_clean)
     except (ValueError, AttributeError):
         return 0.0
 
 
+def clean_text_batch(texts: "pd.Series") -> "pd.Series":
+    """
+    Versão vetorizada de clean_text para uma Series inteira.
+    
+    Aplica as mesmas etapas, na mesma ordem, com os métodos `.str` do
+    pandas em vez de uma chamada Python por linha. Padrões passados como
+    texto rodam no motor de regex do Arrow quando o dtype de string é o do
+    pyarrow; o de espaços segue compilado porque a classe de espaços do
+    Arrow é só ASCII e não cobriria, por exemplo, o espaço não separável.
+    
+    Args:
+        texts: Series com os textos (valores nulos viram "")
+        
+    Returns:
+        Series com os textos limpos
+    """
+    texts = (
+        texts.fillna('').astype(str)
+        .str.strip()
+        .str.replace(_WS_RE, ' ', regex=True)
+        .str.replace(_CTRL_RE.pattern, '', regex=True)
+    )
+    # Series.str.translate não é vetorizado: uma substituição por aspa de destino
+    for pattern, repl in _QUOTE_BATCH:
+        texts = texts.str.replace(pattern, repl, regex=True)
+    return texts
+
+
+def format_price_batch(prices: "pd.Series") -> "pd.Series":
+    """
+    Versão vetorizada de format_price para uma Series inteira.
+    
+    Cada regra de separador de format_price vira uma máscara booleana;
+    textos sem preço válido resultam em 0.0.
+    
+    Args:
+        prices: Series com os textos de preço
+        
+    Returns:
+        Series de floats
+    """
+    # pandas só é carregado por quem usa o caminho em lote
+    import pandas as pd
+    
+    clean = prices.fillna('').astype(str).str.replace(_PRICE_STRIP_RE.pattern, '', regex=True)
+    has_comma = clean.str.contains(',', regex=False)
+    has_dot = clean.str.contains('.', regex=False)
+    
+    decimal_comma = has_comma & (
+        # Ambos: o último separador é o decimal (1.234,56 vs 1,299.99)
+        (has_dot & clean.str.contains(r',[^.,]*$', regex=True))
+        # Só vírgula: decimal se houver uma única e até 2 casas depois dela
+        | (~has_dot & clean.str.contains(r'^[^,]*,[^,]{0,2}$', regex=True))
+    )
+    thousands_comma = has_comma & ~decimal_comma
+    # Só pontos: apenas as linhas com algum grupo de milhar (1.999) precisam de ajuste
+    thousands_dot = has_dot & ~has_comma & clean.str.contains(r'\.\d{3}(?:\D|$)', regex=True)
+    
+    clean = clean.copy()
+    clean[decimal_comma] = (
+        clean[decimal_comma].str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+    )
+    clean[thousands_comma] = clean[thousands_comma].str.replace(',', '', regex=False)
+    # Lookahead não existe no regex do Arrow: este passo usa o re do Python
+    clean[thousands_dot] = clean[thousands_dot].str.replace(_THOUSANDS_DOT_RE, '', regex=True)
+    
+    return pd.to_numeric(clean, errors='coerce').fillna(0.0)
+
+
 def extract_rating(rating_text: str) -> float:
     """
     Extrai avaliação numérica de texto.
@@ -198,7 +395,7 @@ def extract_rating(rating_text: str) -> float:
         return 0.0
     
     # Procurar por números com ponto ou vírgula
-    rating_match = re.search(r'(\d+[.,]?\d*)', str(rating_text))
+    rating_match = _RATING_RE.search(str(rating_text))
     
     if rating_match:
         try:
@@ -232,7 +429,7 @@ def extract_number(text: str) -> int:
         return 0
     
     # Procurar por números
-    number_match = re.search(r'(\d+)', str(text))
+    number_match = _NUMBER_RE.search(str(text))
     
     if number_match:
         try:
@@ -257,8 +454,6 @@ def normalize_url(url: str, base_url: str = "") -> str:
     if not url:
         return ""
     
-    from urllib.parse import urljoin, urlparse
-    
     # Se já é URL absoluta
     if urlparse(url).netloc:
         return url
@@ -318,7 +513,10 @@ def format_currency(value: float, currency: str = "R$") -> str:
         Valor formatado
     """
     try:
-        return f"{currency} {value:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+        # Troca de separadores só no número: o símbolo ("U.S.$") fica intacto.
+        # Três replace em texto curto ainda são mais rápidos que translate/divmod
+        number = f"{value:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+        return f"{currency} {number}"
     except (ValueError, TypeError):
         return f"{currency} 0,00"
 
@@ -336,8 +534,7 @@ def validate_email(email: str) -> bool:
     if not email:
         return False
     
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(_EMAIL_RE.match(email))
 
 
 def get_domain(url: str) -> str:
@@ -350,10 +547,15 @@ def get_domain(url: str) -> str:
     Returns:
         Domínio
     """
+    if not isinstance(url, str):
+        return ""
+    match = _URL_FAST_RE.match(url)
+    if match:
+        return match.group(1)
     try:
-        from urllib.parse import urlparse
         return urlparse(url).netloc
-    except Exception:
+    except ValueError:
+        # Ex.: colchete IPv6 não fechado ("http://[::1")
         return ""
 
 
@@ -367,12 +569,15 @@ def is_valid_url(url: str) -> bool:
     Returns:
         True se válida
     """
+    if not isinstance(url, str):
+        return False
+    if _URL_FAST_RE.match(url):
+        return True
     try:
-        from urllib.parse import urlparse
         result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except Exception:
+    except ValueError:
         return False
+    return bool(result.scheme and result.netloc)
 
 
 def calculate_percentage_change(old_value: float, new_value: float) -> float:
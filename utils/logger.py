@@ -9,16 +9,26 @@ Autor: Seu Nome
 Data: 2025-09-20
 """
 
+import functools
+import os
+import re
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 from loguru import logger
-import os
 
 # Configurar diretório de logs
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 
+# Valores de variáveis locais nos tracebacks: caro em cada log de exceção e
+# pode expor credenciais; ligado apenas com LOGURU_DIAGNOSE=1
+_DIAGNOSE = os.getenv("LOGURU_DIAGNOSE", "0") == "1"
+
+# Módulos (scrapers.*) e contextos ("scraping") cujos registros vão para scraping.log
+_SCRAPING_MATCH = re.compile(r'scrap(?:ing|er)', re.IGNORECASE).search
+
 # Remover handler padrão do loguru
 logger.remove()
 
@@ -37,9 +47,12 @@ logger.add(
     level="INFO",
     colorize=True,
     backtrace=True,
-    diagnose=True
+    diagnose=_DIAGNOSE
 )
 
+# Handlers de arquivo usam enqueue=True: a escrita em disco fica numa thread
+# de fundo e não bloqueia o loop de eventos dos scrapers
+
 # Handler para arquivo geral
 logger.add(
     LOG_DIR / "scraper.log",
@@ -48,8 +61,9 @@ logger.add(
     rotation="10 MB",
     retention="30 days",
     compression="zip",
+    enqueue=True,
     backtrace=True,
-    diagnose=True
+    diagnose=_DIAGNOSE
 )
 
 # Handler para erros
@@ -60,10 +74,18 @@ logger.add(
     rotation="5 MB",
     retention="60 days",
     compression="zip",
+    enqueue=True,
     backtrace=True,
-    diagnose=True
+    diagnose=_DIAGNOSE
 )
 
+
+@functools.lru_cache(maxsize=None)
+def _is_scraping(name: Optional[str]) -> bool:
+    """Se o nome (módulo ou contexto do bind) vai para scraping.log; os nomes são poucos."""
+    return name is not None and _SCRAPING_MATCH(name) is not None
+
+
 # Handler para scraping específico
 logger.add(
     LOG_DIR / "scraping.log",
@@ -72,10 +94,23 @@ logger.add(
     rotation="20 MB",
     retention="15 days",
     compression="zip",
-    filter=lambda record: "scraping" in record["name"].lower() or "scraper" in record["name"].lower()
+    enqueue=True,
+    filter=lambda record: _is_scraping(record["name"]) or _is_scraping(record["extra"].get("name"))
 )
 
 
+# Loggers com contexto fixo, criados uma vez (bind aloca um novo objeto a cada chamada)
+_SCRAPING_LOG = logger.bind(name="scraping")
+_EMAIL_LOG = logger.bind(name="email")
+_DB_LOG = logger.bind(name="database")
+_SCHED_LOG = logger.bind(name="scheduler")
+_PERF_LOG = logger.bind(name="performance")
+_ERROR_LOG = logger.bind(name="error")
+
+# Loggers devolvidos por setup_logger, por nome de módulo
+_module_loggers: dict = {}
+
+
 def setup_logger(name: str, level: str = "INFO") -> logger:
     """
     Configura logger para um módulo específico.
@@ -87,8 +122,12 @@ def setup_logger(name: str, level: str = "INFO") -> logger:
     Returns:
         Logger configurado
     """
+    module_logger = _module_loggers.get(name)
+    if module_logger is not None:
+        return module_logger
+    
     # Criar logger com contexto
-    module_logger = logger.bind(name=name)
+    module_logger = _module_loggers[name] = logger.bind(name=name)
     
     # Log de inicialização
     module_logger.info(f"Logger configurado: {name}")
@@ -106,8 +145,7 @@ def log_scraping_session(session_id: str, site: str, search_term: str, status: s
         search_term: Termo de busca
         status: Status da sessão
     """
-    scraping_logger = logger.bind(name="scraping")
-    scraping_logger.info(
+    _SCRAPING_LOG.info(
         f"Sessão {session_id} | Site: {site} | Busca: '{search_term}' | Status: {status}"
     )
 
@@ -122,9 +160,11 @@ def log_product_found(site: str, title: str, price: float, url: str):
         price: Preço do produto
         url: URL do produto
     """
-    scraping_logger = logger.bind(name="scraping")
-    scraping_logger.debug(
-        f"Produto encontrado | Site: {site} | Título: {title[:50]}... | Preço: R$ {price:.2f}"
+    # Chamado por produto: com lazy, o recorte e a formatação só acontecem
+    # se algum handler aceitar DEBUG
+    _SCRAPING_LOG.opt(lazy=True).debug(
+        "Produto encontrado | Site: {} | Título: {}... | Preço: R$ {:.2f}",
+        lambda: site, lambda: title[:50], lambda: price
     )
 
 
@@ -137,9 +177,8 @@ def log_email_sent(recipients: list, subject: str, success: bool):
         subject: Assunto do e-mail
         success: Se o envio foi bem-sucedido
     """
-    email_logger = logger.bind(name="email")
     status = "SUCESSO" if success else "FALHA"
-    email_logger.info(
+    _EMAIL_LOG.info(
         f"E-mail {status} | Destinatários: {len(recipients)} | Assunto: {subject}"
     )
 
@@ -154,9 +193,8 @@ def log_database_operation(operation: str, table: str, count: int, success: bool
         count: Número de registros afetados
         success: Se a operação foi bem-sucedida
     """
-    db_logger = logger.bind(name="database")
     status = "SUCESSO" if success else "FALHA"
-    db_logger.info(
+    _DB_LOG.info(
         f"BD {status} | Operação: {operation} | Tabela: {table} | Registros: {count}"
     )
 
@@ -170,12 +208,11 @@ def log_scheduler_job(job_name: str, status: str, next_run: Optional[str] = None
         status: Status do job (STARTED, COMPLETED, FAILED, SCHEDULED)
         next_run: Próxima execução (opcional)
     """
-    scheduler_logger = logger.bind(name="scheduler")
     message = f"Job '{job_name}' | Status: {status}"
     if next_run:
         message += f" | Próxima execução: {next_run}"
     
-    scheduler_logger.info(message)
+    _SCHED_LOG.info(message)
 
 
 def log_performance_metric(operation: str, duration: float, details: Optional[str] = None):
@@ -187,12 +224,11 @@ def log_performance_metric(operation: str, duration: float, details: Optional[st
         duration: Duração em segundos
         details: Detalhes adicionais (opcional)
     """
-    perf_logger = logger.bind(name="performance")
     message = f"Operação: {operation} | Duração: {duration:.2f}s"
     if details:
         message += f" | Detalhes: {details}"
     
-    perf_logger.info(message)
+    _PERF_LOG.info(message)
 
 
 def log_error_with_context(error: Exception, context: dict):
@@ -203,8 +239,7 @@ def log_error_with_context(error: Exception, context: dict):
         error: Exceção
         context: Contexto adicional
     """
-    error_logger = logger.bind(name="error")
-    error_logger.error(
+    _ERROR_LOG.error(
         f"Erro: {type(error).__name__}: {str(error)} | Contexto: {context}"
     )
 
@@ -226,7 +261,7 @@ def configure_log_level(level: str):
         level=level,
         colorize=True,
         backtrace=True,
-        diagnose=True
+        diagnose=_DIAGNOSE
     )
     
     logger.add(
@@ -236,8 +271,9 @@ def configure_log_level(level: str):
         rotation="10 MB",
         retention="30 days",
         compression="zip",
+        enqueue=True,
         backtrace=True,
-        diagnose=True
+        diagnose=_DIAGNOSE
     )
     
     logger.info(f"Nível de log configurado para: {level}")
@@ -252,11 +288,15 @@ def get_log_stats() -> dict:
     """
     stats = {}
     
-    for log_file in LOG_DIR.glob("*.log"):
-        if log_file.exists():
-            stats[log_file.name] = {
-                "size_mb": log_file.stat().st_size / (1024 * 1024),
-                "modified": log_file.stat().st_mtime
+    # Uma leitura do diretório e um stat por arquivo (antes: exists + dois stat)
+    with os.scandir(LOG_DIR) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".log") or not entry.is_file():
+                continue
+            st = entry.stat()
+            stats[entry.name] = {
+                "size_mb": st.st_size / (1024 * 1024),
+                "modified": st.st_mtime
             }
     
     return stats
@@ -266,28 +306,26 @@ def cleanup_old_logs(days: int = 30):
     """
     Remove logs antigos.
     
+    Executado diariamente pelo agendador (não mais na importação). Usa
+    os.scandir: uma leitura do diretório e um stat por arquivo.
+    
     Args:
         days: Número de dias para manter logs
     """
-    import time
-    
     cutoff_time = time.time() - (days * 24 * 60 * 60)
     removed_count = 0
     
-    for log_file in LOG_DIR.glob("*.log*"):
-        if log_file.stat().st_mtime < cutoff_time:
+    with os.scandir(LOG_DIR) as entries:
+        for entry in entries:
+            # Mesmo critério do antigo glob("*.log*"): .log e rotacionados (.log.zip)
+            if '.log' not in entry.name or not entry.is_file():
+                continue
             try:
-                log_file.unlink()
-                removed_count += 1
+                if entry.stat().st_mtime < cutoff_time:
+                    os.unlink(entry.path)
+                    removed_count += 1
             except OSError:
                 pass
     
     if removed_count > 0:
         logger.info(f"Removidos {removed_count} arquivos de log antigos")
-
-
-# Configurar limpeza automática na importação
-try:
-    cleanup_old_logs()
-except Exception:
-    pass  # Ignorar erros na limpeza inicial